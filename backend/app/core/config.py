@@ -38,6 +38,10 @@ class P115Settings(BaseSettings):
     model_config = SettingsConfigDict(env_prefix="P115_")
     
     cookies: str = Field(default="", description="115 cookies string")
+    metadata_cache_ttl: float = Field(
+        default=30.0,
+        description="Seconds to cache directory IDs and listings (0 disables)"
+    )
     # Default paths for different use cases
     share_receive_paths: List[str] = Field(
         default=[],
@@ -58,6 +62,20 @@ class StorageSettings(BaseSettings):
     webdav_url: Optional[str] = Field(default=None, description="WebDAV server URL")
     webdav_username: Optional[str] = Field(default=None, description="WebDAV username")
     webdav_password: Optional[str] = Field(default=None, description="WebDAV password")
+    webdav_cache_ttl: float = Field(
+        default=30.0,
+        description="Seconds to cache PROPFIND results (0 disables)"
+    )
+    # Watchdog configuration
+    watchdog_use_polling: bool = Field(
+        default=False,
+        description="Poll local paths instead of using native filesystem events (for network mounts)"
+    )
+    # Transfer configuration
+    transfer_concurrency: int = Field(
+        default=8,
+        description="Max concurrent file moves per transfer request"
+    )
 
 
 class Settings(BaseSettings):
@@ -86,6 +104,12 @@ class Settings(BaseSettings):
         description="Secret key for security"
     )
     
+    # Worker threads for blocking filesystem and client calls
+    thread_pool_size: int = Field(
+        default=16,
+        description="Size of the default executor used by asyncio.to_thread"
+    )
+    
     # API settings
     api_prefix: str = Field(default="/api/v1", description="API route prefix")
     
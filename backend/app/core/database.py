@@ -3,8 +3,9 @@ Database setup and session management
 """
 
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator
 
+import orjson
 from sqlalchemy import MetaData
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
@@ -39,6 +40,11 @@ _engine: AsyncEngine | None = None
 _session_factory: async_sessionmaker[AsyncSession] | None = None
 
 
+def _json_serializer(value: Any) -> str:
+    """Serialize JSON columns with orjson (handles datetime/enum natively)"""
+    return orjson.dumps(value).decode()
+
+
 def get_engine() -> AsyncEngine:
     """Get or create the database engine"""
     global _engine
@@ -46,7 +52,9 @@ def get_engine() -> AsyncEngine:
         _engine = create_async_engine(
             settings.database_url,
             echo=settings.debug,
-            future=True
+            future=True,
+            json_serializer=_json_serializer,
+            json_deserializer=orjson.loads
         )
     return _engine
 
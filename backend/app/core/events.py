@@ -5,7 +5,7 @@ Provides a lightweight pub/sub mechanism for decoupled components.
 
 import asyncio
 import logging
-from typing import Any, Callable, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Set, Union
 from dataclasses import dataclass, field
 from enum import Enum, auto
 from datetime import datetime
@@ -45,6 +45,7 @@ class EventType(str, Enum):
     
     # 115 Life events
     LIFE_EVENT_RECEIVED = "life.event_received"
+    LIFE_EVENTS_RECEIVED_BATCH = "life.events_received_batch"
     LIFE_FILE_UPLOADED = "life.file_uploaded"
     LIFE_FILE_MOVED = "life.file_moved"
     
@@ -81,6 +82,8 @@ class EventBus:
         self._handlers: Dict[EventType, List[EventHandler]] = {}
         self._global_handlers: List[EventHandler] = []
         self._lock = asyncio.Lock()
+        # Emits scheduled by emit_nowait that haven't finished yet
+        self._pending: Set[asyncio.Task] = set()
     
     def subscribe(
         self,
@@ -176,6 +179,28 @@ class EventBus:
             except Exception as e:
                 logger.error(f"Error in event handler for {event_type.value}: {e}")
     
+    def emit_nowait(
+        self,
+        event_type: EventType,
+        data: Optional[Dict[str, Any]] = None,
+        source: str = ""
+    ) -> None:
+        """
+        Schedule an emit without waiting for its handlers.
+        Must be called from a running event loop; use drain() to wait
+        for scheduled emits to finish.
+        """
+        task = asyncio.get_running_loop().create_task(
+            self.emit(event_type, data, source)
+        )
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+    
+    async def drain(self) -> None:
+        """Wait for all emits scheduled by emit_nowait"""
+        while self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+    
     def emit_sync(
         self,
         event_type: EventType,
@@ -3,7 +3,9 @@ OMedia - Media Organizer Application
 FastAPI main entry point
 """
 
+import asyncio
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
@@ -12,6 +14,7 @@ from fastapi.staticfiles import StaticFiles
 
 from .core.config import settings
 from .core.database import init_db, close_db
+from .vfs import close_adapters
 from .routers import share_import, manual_organize, jobs, recognize, rules, config
 
 # Configure logging
@@ -27,6 +30,9 @@ async def lifespan(app: FastAPI):
     """Application lifespan handler"""
     # Startup
     logger.info(f"Starting {settings.app_name}...")
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=settings.thread_pool_size)
+    )
     await init_db()
     logger.info("Database initialized")
     
@@ -34,6 +40,8 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info(f"Shutting down {settings.app_name}...")
+    await close_adapters()
+    logger.info("Storage adapters closed")
     await close_db()
     logger.info("Database connections closed")
 
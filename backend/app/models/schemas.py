@@ -5,7 +5,7 @@ Pydantic schemas for API models
 from datetime import datetime
 from enum import Enum
 from typing import Any, Dict, List, Literal, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 
 class MediaType(str, Enum):
@@ -132,6 +132,11 @@ class RuleCondition(BaseModel):
     field: str  # genre, country, language, keyword, year_range, network, rating
     operator: str  # contains, equals, in, matches, between, gte, lte
     value: Any
+    
+    # Evaluation helpers filled in by the rule engine when a rule is loaded
+    _literal: Optional[str] = PrivateAttr(default=None)
+    # Operand prepared for the operator, e.g. a compiled regex or allowed set
+    _prepared: Optional[Any] = PrivateAttr(default=None)
 
 
 class TransferRule(BaseModel):
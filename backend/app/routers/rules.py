@@ -14,6 +14,7 @@ from sqlalchemy import select
 from ..core.database import get_db
 from ..models.schemas import TransferRule, RuleCondition, StorageType, MediaType
 from ..models.db_models import TransferRuleDB, NamingPatternDB, VersionTagDB
+from ..services.transfer import invalidate_rule_cache
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -127,6 +128,7 @@ async def create_rule(
     db.add(rule)
     await db.commit()
     await db.refresh(rule)
+    invalidate_rule_cache()
     
     return RuleResponse.model_validate(rule)
 
@@ -179,6 +181,7 @@ async def update_rule(
     
     await db.commit()
     await db.refresh(rule)
+    invalidate_rule_cache()
     
     return RuleResponse.model_validate(rule)
 
@@ -197,6 +200,7 @@ async def delete_rule(
     
     await db.delete(rule)
     await db.commit()
+    invalidate_rule_cache()
     
     return {"message": "Rule deleted successfully"}
 
@@ -108,8 +108,41 @@ class PatternExtractor:
         r'\b\d+\.\d+\s*(?:GB|MB)\b',
     ]
     
+    # Extra patterns used by clean_filename_for_search
+    SEARCH_CLEAN_PATTERNS = [
+        r'\[.*?\]',  # [anything]
+        r'\(.*?\)',  # (anything)
+        r'\{.*?\}',  # {anything}
+        r'\b(?:1080|720|480|2160|4K|UHD)[pi]?\b',
+        r'\b(?:BluRay|WEB-DL|WEBRip|HDTV|DVDRip|Remux)\b',
+        r'\b(?:HEVC|[HhXx]\.?26[45]|AVC|VP9)\b',
+        r'\b(?:AAC|AC3|DTS|FLAC|TrueHD|Atmos)[\d\.]*\b',
+        r'\b(?:DD[P\+]?|EAC3)[\d\.]*\b',
+        r'[Ss]\d+[Ee]?\d+.*$',  # Remove everything after S##E##
+        r'-[A-Za-z0-9]+$',  # Release group
+    ]
+    
     def __init__(self):
-        pass
+        # Compile all patterns once so per-file extraction skips re's cache lookup
+        ci = re.IGNORECASE
+        self._season_res = [re.compile(p, ci) for p in self.SEASON_PATTERNS]
+        self._episode_res = [re.compile(p, ci) for p in self.EPISODE_PATTERNS[:4]]
+        self._multi_episode_res = [re.compile(p, ci) for p in self.MULTI_EPISODE_PATTERNS]
+        self._quality_res = [(re.compile(p, ci), v) for p, v in self.QUALITY_PATTERNS]
+        self._source_res = [(re.compile(p, ci), v) for p, v in self.SOURCE_PATTERNS]
+        self._codec_res = [(re.compile(p, ci), v) for p, v in self.CODEC_PATTERNS]
+        self._audio_res = [(re.compile(p, ci), v) for p, v in self.AUDIO_PATTERNS]
+        self._remove_res = [re.compile(p, ci) for p in self.REMOVE_PATTERNS]
+        self._search_clean_res = [re.compile(p, ci) for p in self.SEARCH_CLEAN_PATTERNS]
+        self._year_re = re.compile(r'\b((?:19|20)\d{2})\b')
+        self._group_dash_re = re.compile(r'-([A-Za-z0-9]+)(?:\.\w{2,4})?$')
+        self._group_bracket_re = re.compile(r'\[([A-Za-z0-9]+)\](?:\.\w{2,4})?$')
+        self._episode_only_re = re.compile(r'[Ee][Pp]?(\d+)')
+        self._standalone_num_re = re.compile(r'(?:^|[^\d])(\d{1,3})(?:[^\d]|$)')
+        self._cn_season_num_re = re.compile(r'[一二三四五六七八九十壹贰叁肆伍陆柒捌玖拾]')
+        self._cn_episode_num_re = re.compile(r'[一二三四五六七八九十]')
+        self._separator_re = re.compile(r'[._-]+')
+        self._whitespace_re = re.compile(r'\s+')
     
     def extract(self, filename: str) -> PatternResult:
         """
@@ -124,38 +157,38 @@ class PatternExtractor:
         result = PatternResult()
         
         # Extract quality
-        for pattern, value in self.QUALITY_PATTERNS:
-            if re.search(pattern, filename, re.IGNORECASE):
+        for regex, value in self._quality_res:
+            if regex.search(filename):
                 result.quality = value
                 break
         
         # Extract source
-        for pattern, value in self.SOURCE_PATTERNS:
-            if re.search(pattern, filename, re.IGNORECASE):
+        for regex, value in self._source_res:
+            if regex.search(filename):
                 result.source = value
                 break
         
         # Extract codec
-        for pattern, value in self.CODEC_PATTERNS:
-            if re.search(pattern, filename, re.IGNORECASE):
+        for regex, value in self._codec_res:
+            if regex.search(filename):
                 result.codec = value
                 break
         
         # Extract audio
-        for pattern, value in self.AUDIO_PATTERNS:
-            if re.search(pattern, filename, re.IGNORECASE):
+        for regex, value in self._audio_res:
+            if regex.search(filename):
                 result.audio = value
                 break
         
         # Extract year (4-digit number between 1900-2099)
-        year_match = re.search(r'\b((?:19|20)\d{2})\b', filename)
+        year_match = self._year_re.search(filename)
         if year_match:
             result.year = int(year_match.group(1))
         
         # Extract release group (typically at the end in brackets or after dash)
-        group_match = re.search(r'-([A-Za-z0-9]+)(?:\.\w{2,4})?$', filename)
+        group_match = self._group_dash_re.search(filename)
         if not group_match:
-            group_match = re.search(r'\[([A-Za-z0-9]+)\](?:\.\w{2,4})?$', filename)
+            group_match = self._group_bracket_re.search(filename)
         if group_match:
             result.release_group = group_match.group(1)
         
@@ -176,13 +209,13 @@ class PatternExtractor:
         # Normalize text - remove metadata
         normalized = self._normalize_text(text)
         
-        for pattern in self.SEASON_PATTERNS:
-            match = re.search(pattern, normalized, re.IGNORECASE)
+        for regex in self._season_res:
+            match = regex.search(normalized)
             if match:
                 try:
                     matched_text = match.group(1)
                     # Try Chinese numerals first
-                    if re.search(r'[一二三四五六七八九十壹贰叁肆伍陆柒捌玖拾]', matched_text):
+                    if self._cn_season_num_re.search(matched_text):
                         return self._parse_chinese_number(matched_text)
                     return int(matched_text)
                 except (ValueError, TypeError):
@@ -204,8 +237,8 @@ class PatternExtractor:
         normalized = self._normalize_text(filename)
         
         # Check multi-episode patterns first
-        for pattern in self.MULTI_EPISODE_PATTERNS:
-            match = re.search(pattern, normalized, re.IGNORECASE)
+        for regex in self._multi_episode_res:
+            match = regex.search(normalized)
             if match:
                 groups = match.groups()
                 if len(groups) >= 3:
@@ -216,8 +249,8 @@ class PatternExtractor:
                     return 1, int(groups[0]), int(groups[1])
         
         # Check standard season+episode patterns
-        for pattern in self.EPISODE_PATTERNS[:4]:  # S##E##, ##x##, 第X集
-            match = re.search(pattern, normalized, re.IGNORECASE)
+        for regex in self._episode_res:  # S##E##, ##x##, 第X集
+            match = regex.search(normalized)
             if match:
                 groups = match.groups()
                 try:
@@ -227,7 +260,7 @@ class PatternExtractor:
                     elif len(groups) == 1:
                         # 第X集 format - no season
                         matched_text = groups[0]
-                        if re.search(r'[一二三四五六七八九十]', matched_text):
+                        if self._cn_episode_num_re.search(matched_text):
                             ep = self._parse_chinese_number(matched_text)
                         else:
                             ep = int(matched_text)
@@ -236,14 +269,14 @@ class PatternExtractor:
                     continue
         
         # Check episode-only patterns (EP01, E01)
-        ep_match = re.search(r'[Ee][Pp]?(\d+)', normalized)
+        ep_match = self._episode_only_re.search(normalized)
         if ep_match:
             return None, int(ep_match.group(1)), None
         
         # Fallback: look for standalone numbers
         # Remove extension first
         name_no_ext = normalized.rsplit('.', 1)[0]
-        num_match = re.search(r'(?:^|[^\d])(\d{1,3})(?:[^\d]|$)', name_no_ext)
+        num_match = self._standalone_num_re.search(name_no_ext)
         if num_match:
             num = int(num_match.group(1))
             # Filter out year-like numbers
@@ -255,10 +288,10 @@ class PatternExtractor:
     def _normalize_text(self, text: str) -> str:
         """Remove metadata patterns from text"""
         normalized = text
-        for pattern in self.REMOVE_PATTERNS:
-            normalized = re.sub(pattern, ' ', normalized, flags=re.IGNORECASE)
+        for regex in self._remove_res:
+            normalized = regex.sub(' ', normalized)
         # Clean up whitespace
-        normalized = re.sub(r'\s+', ' ', normalized).strip()
+        normalized = self._whitespace_re.sub(' ', normalized).strip()
         return normalized
     
     def _parse_chinese_number(self, text: str) -> int:
@@ -304,27 +337,14 @@ class PatternExtractor:
                 name = parts[0]
         
         # Remove common patterns
-        patterns_to_remove = [
-            r'\[.*?\]',  # [anything]
-            r'\(.*?\)',  # (anything)
-            r'\{.*?\}',  # {anything}
-            r'\b(?:1080|720|480|2160|4K|UHD)[pi]?\b',
-            r'\b(?:BluRay|WEB-DL|WEBRip|HDTV|DVDRip|Remux)\b',
-            r'\b(?:HEVC|[HhXx]\.?26[45]|AVC|VP9)\b',
-            r'\b(?:AAC|AC3|DTS|FLAC|TrueHD|Atmos)[\d\.]*\b',
-            r'\b(?:DD[P\+]?|EAC3)[\d\.]*\b',
-            r'[Ss]\d+[Ee]?\d+.*$',  # Remove everything after S##E##
-            r'-[A-Za-z0-9]+$',  # Release group
-        ]
-        
-        for pattern in patterns_to_remove:
-            name = re.sub(pattern, ' ', name, flags=re.IGNORECASE)
+        for regex in self._search_clean_res:
+            name = regex.sub(' ', name)
         
         # Replace separators with spaces
-        name = re.sub(r'[._-]+', ' ', name)
+        name = self._separator_re.sub(' ', name)
         
         # Clean up whitespace
-        name = re.sub(r'\s+', ' ', name).strip()
+        name = self._whitespace_re.sub(' ', name).strip()
         
         return name
 
@@ -3,13 +3,16 @@ Recognition Service
 Orchestrates LLM extraction, TMDB lookup, and caching.
 """
 
+import asyncio
 import hashlib
 import logging
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import Row, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 from .llm_agent import LLMAgent, ExtractedMediaInfo
 from .tmdb_client import TMDBClient, TMDBResult
@@ -23,6 +26,16 @@ from ...core.events import event_bus, EventType
 
 logger = logging.getLogger(__name__)
 
+# Batches larger than this run regex extraction in the default executor
+# so the event loop keeps serving LLM/TMDB coroutines
+PATTERN_OFFLOAD_THRESHOLD = 16
+
+# Dialects supporting INSERT ... ON CONFLICT DO UPDATE for cache writes
+_UPSERT_INSERTS = {
+    "postgresql": pg_insert,
+    "sqlite": sqlite_insert,
+}
+
 
 class RecognitionService:
     """
@@ -58,13 +71,15 @@ class RecognitionService:
         )
         
         results = []
+        offload_patterns = len(files) > PATTERN_OFFLOAD_THRESHOLD
         
         for file_info in files:
             try:
                 result = await self.recognize_single(
                     file_info,
                     media_type,
-                    db
+                    db,
+                    offload_patterns=offload_patterns
                 )
                 results.append(result)
             except Exception as e:
@@ -93,7 +108,8 @@ class RecognitionService:
         self,
         file_info: FileInfo,
         media_type: MediaType,
-        db: AsyncSession
+        db: AsyncSession,
+        offload_patterns: bool = False
     ) -> RecognitionResult:
         """
         Recognize a single media file.
@@ -102,6 +118,7 @@ class RecognitionService:
             file_info: File information
             media_type: Expected media type
             db: Database session
+            offload_patterns: Run pattern extraction in a worker thread
             
         Returns:
             RecognitionResult
@@ -117,7 +134,12 @@ class RecognitionService:
             return self._cached_to_result(file_info, cached)
         
         # Extract patterns first (fast)
-        pattern_result = self.pattern_extractor.extract(filename)
+        if offload_patterns:
+            pattern_result = await asyncio.to_thread(
+                self.pattern_extractor.extract, filename
+            )
+        else:
+            pattern_result = self.pattern_extractor.extract(filename)
         
         # Use LLM for title extraction
         llm_result = await self.llm_agent.extract_single(
@@ -355,14 +377,17 @@ class RecognitionService:
         self,
         db: AsyncSession,
         file_hash: str
-    ) -> Optional[RecognitionCacheDB]:
-        """Get cached recognition result"""
+    ) -> Optional[Row]:
+        """Get cached recognition result (only the columns we read)"""
         result = await db.execute(
-            select(RecognitionCacheDB).where(
+            select(
+                RecognitionCacheDB.recognition_data,
+                RecognitionCacheDB.confidence
+            ).where(
                 RecognitionCacheDB.file_hash == file_hash
-            )
+            ).limit(1)
         )
-        return result.scalar_one_or_none()
+        return result.first()
     
     async def _cache_result(
         self,
@@ -373,30 +398,57 @@ class RecognitionService:
         result: RecognitionResult
     ) -> None:
         """Cache recognition result"""
-        # Check if already cached
-        existing = await self._get_cached_result(db, file_hash)
-        
         cache_data = {
             "media_info": result.media_info.model_dump() if result.media_info else None,
             "llm_extracted": result.llm_extracted,
             "user_override": result.user_override
         }
         
-        if existing:
+        media_info = result.media_info
+        tmdb_id = str(media_info.tmdb_id) if media_info and media_info.tmdb_id else None
+        
+        # Values applied when the entry already exists
+        update_values = {
+            "recognition_data": cache_data,
+            "confidence": result.confidence.value,
+            "updated_at": datetime.utcnow(),
+        }
+        if media_info:
+            update_values["media_type"] = media_info.media_type.value
+            update_values["tmdb_id"] = tmdb_id
+        
+        insert_fn = _UPSERT_INSERTS.get(db.bind.dialect.name) if db.bind else None
+        
+        if insert_fn is not None:
+            # Single round-trip upsert keyed on the unique file_hash
+            stmt = insert_fn(RecognitionCacheDB).values(
+                file_hash=file_hash,
+                file_name=filename,
+                file_size=file_size,
+                media_type=media_info.media_type.value if media_info else "unknown",
+                tmdb_id=tmdb_id,
+                recognition_data=cache_data,
+                confidence=result.confidence.value
+            ).on_conflict_do_update(
+                index_elements=[RecognitionCacheDB.file_hash],
+                set_=update_values
+            )
+            await db.execute(stmt)
+        elif await self._get_cached_result(db, file_hash):
             # Update existing
-            existing.recognition_data = cache_data
-            existing.confidence = result.confidence.value
-            if result.media_info:
-                existing.media_type = result.media_info.media_type.value
-                existing.tmdb_id = str(result.media_info.tmdb_id) if result.media_info.tmdb_id else None
+            await db.execute(
+                update(RecognitionCacheDB)
+                .where(RecognitionCacheDB.file_hash == file_hash)
+                .values(**update_values)
+            )
         else:
             # Create new
             cache_entry = RecognitionCacheDB(
                 file_hash=file_hash,
                 file_name=filename,
                 file_size=file_size,
-                media_type=result.media_info.media_type.value if result.media_info else "unknown",
-                tmdb_id=str(result.media_info.tmdb_id) if result.media_info and result.media_info.tmdb_id else None,
+                media_type=media_info.media_type.value if media_info else "unknown",
+                tmdb_id=tmdb_id,
                 recognition_data=cache_data,
                 confidence=result.confidence.value
             )
@@ -407,7 +459,7 @@ class RecognitionService:
     def _cached_to_result(
         self,
         file_info: FileInfo,
-        cached: RecognitionCacheDB
+        cached: Row
     ) -> RecognitionResult:
         """Convert cached data to RecognitionResult"""
         data = cached.recognition_data or {}
@@ -421,11 +473,8 @@ class RecognitionService:
         )
         
         if media_info_data:
-            # Reconstruct MediaInfo
-            media_info_data["media_type"] = MediaType(media_info_data["media_type"])
-            if media_info_data.get("tmdb_info"):
-                media_info_data["tmdb_info"] = TMDBInfo(**media_info_data["tmdb_info"])
-            result.media_info = MediaInfo(**media_info_data)
+            # Pydantic coerces the nested tmdb_info dict and media_type string
+            result.media_info = MediaInfo.model_validate(media_info_data)
         
         return result
     
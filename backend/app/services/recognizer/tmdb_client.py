@@ -8,8 +8,9 @@ import logging
 import time
 import threading
 import re
-from typing import List, Dict, Optional, Any, Tuple
-from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import List, Dict, Optional, Any, Tuple, Callable, Awaitable
+from dataclasses import dataclass, field, replace
 from datetime import datetime
 
 import httpx
@@ -19,6 +20,12 @@ from ...core.config import settings
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=1024)
+def _endpoint_url(base_url: str, endpoint: str) -> str:
+    """Build (and memoize) the full URL for an API endpoint"""
+    return f"{base_url}{endpoint}"
+
+
 @dataclass
 class TMDBResult:
     """TMDB search/details result"""
@@ -86,18 +93,32 @@ class TMDBClient:
         self.languages = languages or settings.tmdb.languages
         self.rate_limit = rate_limit or settings.tmdb.rate_limit
         
+        # Constant request parameters, built once
+        self._base_params = {"api_key": self.api_key}
+        self._default_language = self.languages[0] if self.languages else None
+        
         self._min_interval = 1.0 / self.rate_limit
         self._last_request_time = 0.0
         self._lock = asyncio.Lock()
         
+        # In-flight lookups keyed by request, shared by concurrent callers
+        self._inflight: Dict[tuple, asyncio.Task] = {}
+        
         # Configure HTTP client
         transport_kwargs = {}
         if proxy_host and proxy_port:
             proxy_url = f"http://{proxy_host}:{proxy_port}"
             transport_kwargs["proxy"] = proxy_url
         
+        # HTTP/2 lets concurrent lookups share one TLS connection
         self._client = httpx.AsyncClient(
+            http2=True,
             timeout=30.0,
+            limits=httpx.Limits(
+                max_connections=100,
+                max_keepalive_connections=50,
+                keepalive_expiry=60.0
+            ),
             headers={"X-Forwarded-Host": "api.themoviedb.org"},
             **transport_kwargs
         )
@@ -115,6 +136,20 @@ class TMDBClient:
             
             self._last_request_time = time.time()
     
+    async def _single_flight(
+        self,
+        key: tuple,
+        fetch: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Run fetch once for all concurrent callers with the same key"""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fetch())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shield so one caller's cancellation doesn't cancel the shared fetch
+        return await asyncio.shield(task)
+    
     async def _request(
         self,
         endpoint: str,
@@ -124,16 +159,12 @@ class TMDBClient:
         """Make API request with rate limiting and error handling"""
         await self._wait_for_rate_limit()
         
-        url = f"{self.BASE_URL}{endpoint}"
-        request_params = {
-            "api_key": self.api_key,
-            **(params or {})
-        }
+        url = _endpoint_url(self.BASE_URL, endpoint)
+        request_params = {**self._base_params, **(params or {})}
         
+        language = language or self._default_language
         if language:
             request_params["language"] = language
-        elif self.languages:
-            request_params["language"] = self.languages[0]
         
         try:
             response = await self._client.get(url, params=request_params)
@@ -228,6 +259,19 @@ class TMDBClient:
         language: Optional[str] = None
     ) -> Optional[TMDBResult]:
         """Get movie details by ID"""
+        result = await self._single_flight(
+            ("movie", movie_id, language),
+            lambda: self._fetch_movie_details(movie_id, language)
+        )
+        # Callers mutate match_confidence, so hand each one its own copy
+        return replace(result) if result else None
+    
+    async def _fetch_movie_details(
+        self,
+        movie_id: int,
+        language: Optional[str] = None
+    ) -> Optional[TMDBResult]:
+        """Fetch movie details from the API"""
         params = {"append_to_response": "alternative_titles"}
         data = await self._request(f"/movie/{movie_id}", params, language)
         
@@ -258,6 +302,18 @@ class TMDBClient:
         language: Optional[str] = None
     ) -> Optional[TMDBResult]:
         """Get TV show details by ID"""
+        result = await self._single_flight(
+            ("tv", tv_id, language),
+            lambda: self._fetch_tv_details(tv_id, language)
+        )
+        return replace(result) if result else None
+    
+    async def _fetch_tv_details(
+        self,
+        tv_id: int,
+        language: Optional[str] = None
+    ) -> Optional[TMDBResult]:
+        """Fetch TV show details from the API"""
         params = {"append_to_response": "alternative_titles"}
         data = await self._request(f"/tv/{tv_id}", params, language)
         
@@ -310,6 +366,19 @@ class TMDBClient:
         Returns:
             Tuple of (results, language_used)
         """
+        results, lang = await self._single_flight(
+            ("search", query, media_type, year),
+            lambda: self._search_languages(query, media_type, year)
+        )
+        return [replace(r) for r in results], lang
+    
+    async def _search_languages(
+        self,
+        query: str,
+        media_type: str,
+        year: Optional[int] = None
+    ) -> Tuple[List[TMDBResult], Optional[str]]:
+        """Try each configured language in turn until one has results"""
         search_fn = self.search_movie if media_type == "movie" else self.search_tv
         
         for lang in self.languages:
@@ -353,6 +422,15 @@ class TMDBClient:
         # Get first result (TMDB typically returns best matches first)
         best = results[0]
         
+        # Score using search fields only; alternative titles can only add
+        # to this, so a high preliminary score makes the details call moot
+        preliminary = self._score_match(
+            best, query, year, original_filename, len(results)
+        )
+        if preliminary >= 5:
+            best.match_confidence = "high"
+            return best
+        
         # Get full details
         if media_type == "movie":
             details = await self.get_movie_details(best.tmdb_id, lang)
@@ -379,6 +457,25 @@ class TMDBClient:
         total_results: int
     ) -> str:
         """Calculate match confidence"""
+        score = self._score_match(result, query, year, filename, total_results)
+        
+        # Determine confidence level
+        if score >= 5:
+            return "high"
+        elif score >= 3:
+            return "medium"
+        else:
+            return "low"
+    
+    def _score_match(
+        self,
+        result: TMDBResult,
+        query: str,
+        year: Optional[int],
+        filename: Optional[str],
+        total_results: int
+    ) -> int:
+        """Score how well a result matches the query"""
         score = 0
         
         # Title match
@@ -411,22 +508,15 @@ class TMDBClient:
         if total_results == 1:
             score += 1
         
-        # Determine confidence level
-        if score >= 5:
-            return "high"
-        elif score >= 3:
-            return "medium"
-        else:
-            return "low"
+        return score
     
     def _extract_year(self, date_str: Optional[str]) -> Optional[int]:
         """Extract year from date string (YYYY-MM-DD)"""
-        if not date_str:
-            return None
-        try:
+        # TMDB sends "" for unreleased items; check digits instead of
+        # paying for a raised ValueError on every miss
+        if date_str and len(date_str) >= 4 and date_str[:4].isdigit():
             return int(date_str[:4])
-        except (ValueError, IndexError):
-            return None
+        return None
     
     def _extract_alternative_titles(
         self,
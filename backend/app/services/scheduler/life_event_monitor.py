@@ -5,28 +5,70 @@ Monitors 115 cloud storage life events for file changes.
 
 import asyncio
 import logging
-from typing import Dict, Optional, Callable, Any, List, Set
-from datetime import datetime
+import random
+from collections import OrderedDict, defaultdict
+from typing import Dict, Optional, Callable, Any, List, Set, Tuple, NamedTuple
 
 from ...core.events import event_bus, EventType
 from ...core.config import settings
-from ...models.schemas import FileInfo, StorageType
+from ...models.schemas import StorageType
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of processed event keys remembered for de-duplication
+SEEN_EVENTS_MAX = 131072
+
+# Poll intervals in seconds: after new events, base for idle backoff,
+# idle backoff cap, and after a failed poll (e.g. rate limited)
+POLL_ACTIVE_DELAY = 10
+POLL_IDLE_DELAY = 30
+POLL_MAX_DELAY = 600
+POLL_ERROR_DELAY = 300
+
+
+class _LifeEvt(NamedTuple):
+    """Fields of a life event, read once from the API response"""
+    type: str
+    file_name: str
+    file_path: str
+    file_id: str
+    time: str
+
 
 class LifeEventMonitor:
     """Monitors 115 cloud storage life events"""
     
-    def __init__(self, on_file_detected: Optional[Callable] = None):
+    def __init__(
+        self,
+        on_file_detected: Optional[Callable] = None,
+        on_files_detected: Optional[Callable] = None
+    ):
         self._running = False
         self._jobs: Dict[str, Dict[str, Any]] = {}
         self._on_file_detected = on_file_detected
+        # Batch callback taking (job_id, paths); preferred over the per-file one
+        self._on_files_detected = on_files_detected
         self._client = None
         self._monitor_task: Optional[asyncio.Task] = None
-        self._last_event_time: Dict[str, datetime] = {}
+        # LRU set of hashed (job_id, file_id, time) keys already processed
+        self._seen_events: "OrderedDict[int, None]" = OrderedDict()
+        # Event type -> monitored path -> job IDs, rebuilt lazily when jobs change
+        self._path_index: Optional[Dict[str, Dict[str, List[str]]]] = None
+        self._empty_polls = 0
+        # Created lazily so the monitor can be built before an event loop runs
+        self._wake: Optional[asyncio.Event] = None
+    
+    def _wake_event(self) -> asyncio.Event:
+        """Get the event used to wake the monitor loop early"""
+        if self._wake is None:
+            self._wake = asyncio.Event()
+        return self._wake
     
-    async def _ensure_client(self):
+    def wake(self):
+        """Trigger an immediate poll instead of waiting for the interval"""
+        self._wake_event().set()
+    
+    async def ensure_client(self):
         """Ensure 115 client is initialized"""
         if self._client is not None:
             return
@@ -64,19 +106,24 @@ class LifeEventMonitor:
             return False
         
         try:
-            await self._ensure_client()
+            await self.ensure_client()
             
             self._jobs[job_id] = {
                 "path": path,
-                "event_types": event_types or ["upload", "move"],
+                "event_types": frozenset(event_types or ["upload", "move"]),
                 "enabled": True
             }
+            self._path_index = None
             
             # Start the monitor loop if not running
             if not self._running:
                 self._running = True
                 self._monitor_task = asyncio.create_task(self._monitor_loop())
             
+            # Poll right away so the new job doesn't wait a full interval
+            self._empty_polls = 0
+            self.wake()
+            
             logger.info(f"Started life event monitoring for job {job_id} on path {path}")
             return True
             
@@ -99,10 +146,12 @@ class LifeEventMonitor:
             return False
         
         del self._jobs[job_id]
+        self._path_index = None
         
         # Stop the monitor loop if no more jobs
         if not self._jobs and self._monitor_task:
             self._running = False
+            self.wake()
             self._monitor_task.cancel()
             try:
                 await self._monitor_task
@@ -117,6 +166,8 @@ class LifeEventMonitor:
         """Stop all monitors"""
         self._running = False
         self._jobs.clear()
+        self._path_index = None
+        self.wake()
         
         if self._monitor_task:
             self._monitor_task.cancel()
@@ -129,14 +180,19 @@ class LifeEventMonitor:
     async def _monitor_loop(self):
         """Main monitoring loop"""
         logger.info("Life event monitor loop started")
+        wake = self._wake_event()
         
         while self._running:
             try:
                 # Poll for events
-                await self._poll_events()
+                count = await self._poll_events()
                 
-                # Wait before next poll
-                await asyncio.sleep(30)  # Poll every 30 seconds
+                # Wait before next poll unless woken (e.g. a new job)
+                try:
+                    await asyncio.wait_for(wake.wait(), timeout=self._next_delay(count))
+                    wake.clear()
+                except asyncio.TimeoutError:
+                    pass
                 
             except asyncio.CancelledError:
                 break
@@ -146,88 +202,166 @@ class LifeEventMonitor:
         
         logger.info("Life event monitor loop stopped")
     
-    async def _poll_events(self):
-        """Poll for new life events"""
+    def _next_delay(self, count: Optional[int]) -> float:
+        """Get the wait before the next poll, backing off while idle or failing"""
+        if count is None:
+            delay = POLL_ERROR_DELAY
+        elif count == 0:
+            delay = min(POLL_IDLE_DELAY * 2 ** min(self._empty_polls, 5), POLL_MAX_DELAY)
+            self._empty_polls += 1
+        else:
+            delay = POLL_ACTIVE_DELAY
+            self._empty_polls = 0
+        
+        # Jitter so restarts don't line up polls
+        return delay + random.uniform(0, 0.1) * delay
+    
+    async def _poll_events(self) -> Optional[int]:
+        """
+        Poll for new life events.
+        
+        Returns:
+            Number of new events detected, or None if the poll failed
+        """
         if not self._client:
-            return
+            return 0
         
         try:
             # Use p115client to get life events
             # This is a simplified implementation - actual implementation
             # would use the life event API from p115strmhelper
             
-            # Get recent file changes
-            events = await asyncio.to_thread(
-                self._client.life_list,
-                {"limit": 100}
-            )
+            # Get recent file changes; async_=True makes p115client issue
+            # the request on its own async HTTP client instead of a thread
+            events = await self._client.life_list({"limit": 100}, async_=True)
             
-            if not events or events.get("errNo", 0) != 0:
-                return
+            if not events:
+                return 0
+            
+            if events.get("errNo", 0) != 0:
+                logger.warning(f"Life event poll failed (errNo {events.get('errNo')}), backing off")
+                return None
+            
+            to_emit: List[Dict[str, Any]] = []
+            to_dispatch: List[Tuple[str, str]] = []
+            data = events.get("data") or {}
+            for event in data.get("list") or ():
+                self._process_event(
+                    _LifeEvt(
+                        event.get("type", ""),
+                        event.get("file_name", ""),
+                        event.get("file_path", ""),
+                        event.get("file_id", ""),
+                        event.get("time", "")
+                    ),
+                    to_emit,
+                    to_dispatch
+                )
             
-            for event in events.get("data", {}).get("list", []):
-                await self._process_event(event)
+            if to_emit:
+                await event_bus.emit(
+                    EventType.LIFE_EVENTS_RECEIVED_BATCH,
+                    {"events": to_emit}
+                )
+            
+            if to_dispatch:
+                await self._dispatch(to_dispatch)
+            
+            return len(to_emit)
                 
         except Exception as e:
             logger.error(f"Error polling life events: {e}")
+            return None
+    
+    async def _dispatch(self, detected: List[Tuple[str, str]]):
+        """Hand detected files to the callbacks, grouped per job"""
+        by_job: Dict[str, List[str]] = defaultdict(list)
+        for job_id, file_path in detected:
+            by_job[job_id].append(file_path)
+        
+        if self._on_files_detected:
+            await asyncio.gather(*(
+                self._on_files_detected(job_id, paths)
+                for job_id, paths in by_job.items()
+            ))
+        elif self._on_file_detected:
+            for job_id, paths in by_job.items():
+                for file_path in paths:
+                    await self._on_file_detected(job_id, file_path)
     
-    async def _process_event(self, event: Dict[str, Any]):
-        """Process a single life event"""
+    def _process_event(
+        self,
+        event: _LifeEvt,
+        to_emit: List[Dict[str, Any]],
+        to_dispatch: List[Tuple[str, str]]
+    ):
+        """Collect event payloads and detected files for a single life event"""
         try:
-            event_type = event.get("type", "")
-            file_name = event.get("file_name", "")
-            file_path = event.get("file_path", "")
-            file_id = event.get("file_id", "")
-            event_time = event.get("time", "")
+            event_type, file_name, file_path, file_id, event_time = event
             
-            # Check if any job is interested in this path
-            for job_id, job_config in self._jobs.items():
-                monitored_path = job_config["path"]
-                allowed_types = job_config["event_types"]
-                
-                # Check if event type is monitored
-                if event_type not in allowed_types:
-                    continue
-                
-                # Check if file is in monitored path
-                if not file_path.startswith(monitored_path):
-                    continue
-                
+            # Check which jobs monitor this event type on a path containing the file
+            for job_id in self._matching_jobs(event_type, file_path):
                 # Check if we've already processed this event
-                event_key = f"{job_id}:{file_id}:{event_time}"
-                if event_key in self._last_event_time:
+                if self._seen(hash((job_id, file_id, event_time))):
                     continue
                 
-                self._last_event_time[event_key] = datetime.now()
-                
-                # Create file info
-                file_info = FileInfo(
-                    name=file_name,
-                    path=file_path,
-                    file_id=file_id,
-                    is_dir=False,
-                    storage_type=StorageType.P115
-                )
-                
-                # Emit event
-                await event_bus.emit(
-                    EventType.LIFE_EVENT_RECEIVED,
-                    {
-                        "job_id": job_id,
-                        "event_type": event_type,
-                        "file_info": file_info.model_dump()
+                # File info payload, laid out as FileInfo.model_dump() would
+                to_emit.append({
+                    "job_id": job_id,
+                    "event_type": event_type,
+                    "file_info": {
+                        "name": file_name,
+                        "path": file_path,
+                        "size": 0,
+                        "is_dir": False,
+                        "extension": None,
+                        "modified_time": None,
+                        "pickcode": None,
+                        "file_id": file_id,
+                        "storage_type": StorageType.P115
                     }
-                )
-                
-                # Call callback
-                if self._on_file_detected:
-                    await self._on_file_detected(job_id, file_path)
+                })
+                to_dispatch.append((job_id, file_path))
                 
                 logger.debug(f"Processed life event for {file_name} (job: {job_id})")
                 
         except Exception as e:
             logger.error(f"Error processing life event: {e}")
     
+    def _matching_jobs(self, event_type: str, file_path: str) -> List[str]:
+        """Get IDs of jobs monitoring the event type on a path containing the file"""
+        if self._path_index is None:
+            type_index: Dict[str, Dict[str, List[str]]] = {}
+            for job_id, job_config in self._jobs.items():
+                path = job_config["path"].rstrip("/")
+                for allowed_type in job_config["event_types"]:
+                    type_index.setdefault(allowed_type, {}).setdefault(path, []).append(job_id)
+            self._path_index = type_index
+        
+        index = self._path_index.get(event_type)
+        if not index:
+            return []
+        
+        # Look up the path itself and each of its ancestor directories
+        matches = list(index.get(file_path, ()))
+        pos = file_path.find("/")
+        while pos != -1:
+            matches.extend(index.get(file_path[:pos], ()))
+            pos = file_path.find("/", pos + 1)
+        return matches
+    
+    def _seen(self, event_key: int) -> bool:
+        """Check and record an event key, evicting the oldest beyond the limit"""
+        seen = self._seen_events
+        if event_key in seen:
+            seen.move_to_end(event_key)
+            return True
+        
+        seen[event_key] = None
+        if len(seen) > SEEN_EVENTS_MAX:
+            seen.popitem(last=False)
+        return False
+    
     def is_monitoring(self, job_id: str) -> bool:
         """Check if a job is being monitored"""
         return job_id in self._jobs
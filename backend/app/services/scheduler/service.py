@@ -4,19 +4,23 @@ Manages watchdog and life event monitoring jobs.
 """
 
 import asyncio
+import itertools
 import logging
-from typing import Dict, Optional, List
+import os
+from collections import defaultdict
+from typing import Dict, Optional, List, Set, Tuple
 from datetime import datetime
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update, case
 
 from .watchdog_monitor import WatchdogMonitor
 from .life_event_monitor import LifeEventMonitor
 from ..recognizer import RecognitionService
 from ..transfer import TransferService
 from ...models.schemas import (
-    Job, JobStatus, StorageType, MediaType, ConfidenceLevel, FileInfo
+    Job, JobStatus, StorageType, MediaType, ConfidenceLevel, FileInfo,
+    RecognitionResult
 )
 from ...models.db_models import JobDB
 from ...core.database import get_db_context
@@ -24,6 +28,46 @@ from ...core.events import event_bus, EventType
 
 logger = logging.getLogger(__name__)
 
+# Detected files are flushed once a batch is full or the window has elapsed
+BATCH_SIZE = 100
+BATCH_WINDOW = 5.0
+# Upper bound on queued paths per job before producers wait
+QUEUE_MAXSIZE = 10000
+# Number of recognition chunks run concurrently per batch, each with its
+# own DB session (bounded to keep connection usage small)
+RECOGNITION_CONCURRENCY = 4
+# Seconds between coalesced job last_run_at writes
+TIMESTAMP_FLUSH_INTERVAL = 1.0
+
+# Ordering of confidence levels for threshold comparisons
+_CONF_RANK = {
+    ConfidenceLevel.HIGH: 3,
+    ConfidenceLevel.MEDIUM: 2,
+    ConfidenceLevel.LOW: 1,
+}
+
+
+def _stat_paths(paths: List[str]) -> Dict[str, os.stat_result]:
+    """Stat files with one directory scan per parent instead of per-file calls"""
+    by_dir: Dict[str, Set[str]] = defaultdict(set)
+    for path in paths:
+        by_dir[os.path.dirname(path)].add(os.path.basename(path))
+    
+    stat_map: Dict[str, os.stat_result] = {}
+    for directory, names in by_dir.items():
+        try:
+            with os.scandir(directory or ".") as it:
+                for entry in it:
+                    if entry.name in names:
+                        try:
+                            stat_map[os.path.join(directory, entry.name)] = entry.stat()
+                        except OSError:
+                            pass
+        except OSError:
+            pass
+    
+    return stat_map
+
 
 class SchedulerService:
     """
@@ -42,16 +86,25 @@ class SchedulerService:
             on_file_detected=self._handle_detected_file
         )
         self.life_event_monitor = LifeEventMonitor(
-            on_file_detected=self._handle_detected_file
+            on_files_detected=self._handle_detected_files
         )
         
-        self._pending_files: Dict[str, List[str]] = {}  # job_id -> list of paths
-        self._processing_lock = asyncio.Lock()
+        self._queues: Dict[str, asyncio.Queue] = {}  # job_id -> queue of paths
+        self._batch_tasks: Dict[str, asyncio.Task] = {}
+        self._pending_paths: Dict[str, Set[str]] = {}  # job_id -> queued paths
+        self._job_cache: Dict[str, JobDB] = {}  # job_id -> detached job row
+        
+        # last_run_at updates, written in bulk by a background task
+        self._timestamp_q: "asyncio.Queue[Tuple[str, datetime]]" = asyncio.Queue()
+        self._timestamp_task: Optional[asyncio.Task] = None
     
     async def start(self):
         """Start the scheduler service and load enabled jobs"""
         logger.info("Starting scheduler service...")
         
+        if self._timestamp_task is None:
+            self._timestamp_task = asyncio.create_task(self._timestamp_writer())
+        
         async with get_db_context() as db:
             # Load enabled jobs
             result = await db.execute(
@@ -61,9 +114,21 @@ class SchedulerService:
                 )
             )
             jobs = result.scalars().all()
-            
-            for job in jobs:
-                await self._start_job(job)
+        
+        # Create the shared 115 client once instead of racing on it per job
+        if any(job.job_type == "life_event" for job in jobs):
+            try:
+                await self.life_event_monitor.ensure_client()
+            except Exception as e:
+                logger.error(f"Failed to initialize 115 client: {e}")
+        
+        results = await asyncio.gather(
+            *(self._start_job(job) for job in jobs),
+            return_exceptions=True
+        )
+        for job, result in zip(jobs, results):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to start job {job.id}: {result}")
         
         logger.info(f"Scheduler service started with {len(jobs)} active jobs")
     
@@ -71,9 +136,13 @@ class SchedulerService:
         """Stop the scheduler service"""
         logger.info("Stopping scheduler service...")
         
-        self.watchdog_monitor.stop_all()
-        await self.life_event_monitor.stop_all()
-        await self.recognition_service.close()
+        await self._stop_batch_workers()
+        await self._stop_timestamp_writer()
+        await asyncio.gather(
+            asyncio.to_thread(self.watchdog_monitor.stop_all),
+            self.life_event_monitor.stop_all(),
+            self.recognition_service.close()
+        )
         
         logger.info("Scheduler service stopped")
     
@@ -93,6 +162,9 @@ class SchedulerService:
     
     async def stop_job(self, job_id: str) -> bool:
         """Stop a specific job"""
+        await self._stop_batch_workers(job_id)
+        self._job_cache.pop(job_id, None)
+        
         # Try watchdog first
         if self.watchdog_monitor.is_monitoring(job_id):
             return self.watchdog_monitor.stop_monitoring(job_id)
@@ -108,13 +180,13 @@ class SchedulerService:
         """Internal method to start a job"""
         try:
             if job.job_type == "watchdog":
-                return self.watchdog_monitor.start_monitoring(
+                started = self.watchdog_monitor.start_monitoring(
                     job_id=job.id,
                     path=job.source_path,
                     poll_interval=job.poll_interval
                 )
             elif job.job_type == "life_event":
-                return await self.life_event_monitor.start_monitoring(
+                started = await self.life_event_monitor.start_monitoring(
                     job_id=job.id,
                     path=job.source_path,
                     event_types=job.event_types
@@ -122,6 +194,10 @@ class SchedulerService:
             else:
                 logger.error(f"Unknown job type: {job.job_type}")
                 return False
+            
+            if started:
+                self._job_cache[job.id] = job
+            return started
                 
         except Exception as e:
             logger.error(f"Failed to start job {job.id}: {e}")
@@ -131,23 +207,71 @@ class SchedulerService:
         """
         Handle a detected file from watchdog or life event.
         
-        Implements batching to avoid processing files one at a time.
+        Files are queued per job and processed in batches by a single
+        worker, so bursts of detections share one processing run.
         """
-        async with self._processing_lock:
-            # Add to pending queue
-            if job_id not in self._pending_files:
-                self._pending_files[job_id] = []
-            
-            self._pending_files[job_id].append(file_path)
+        queue = self._queues.get(job_id)
+        if queue is None:
+            queue = self._queues[job_id] = asyncio.Queue(maxsize=QUEUE_MAXSIZE)
+            self._pending_paths[job_id] = set()
+            self._batch_tasks[job_id] = asyncio.create_task(
+                self._batch_worker(job_id, queue)
+            )
         
-        # Schedule processing after a delay (batching)
-        await asyncio.sleep(5)  # Wait 5 seconds for more files
+        # Skip paths already waiting in this job's queue
+        pending = self._pending_paths[job_id]
+        if file_path in pending:
+            return
+        pending.add(file_path)
         
-        async with self._processing_lock:
-            files_to_process = self._pending_files.pop(job_id, [])
+        await queue.put(file_path)
+    
+    async def _handle_detected_files(self, job_id: str, file_paths: List[str]):
+        """Handle a group of files detected together for one job"""
+        for file_path in file_paths:
+            await self._handle_detected_file(job_id, file_path)
+    
+    async def _batch_worker(self, job_id: str, queue: asyncio.Queue):
+        """Drain a job's queue, flushing on batch size or batching window"""
+        loop = asyncio.get_running_loop()
         
-        if files_to_process:
-            await self._process_detected_files(job_id, files_to_process)
+        while True:
+            # Block until the first file of the next batch arrives
+            batch = [await queue.get()]
+            deadline = loop.time() + BATCH_WINDOW
+            
+            while len(batch) < BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            # Paths detected again from here on belong to the next batch
+            self._pending_paths[job_id].difference_update(batch)
+            
+            try:
+                await self._process_detected_files(job_id, batch)
+            except Exception as e:
+                logger.error(f"Failed to process detected files for job {job_id}: {e}")
+    
+    async def _stop_batch_workers(self, job_id: Optional[str] = None):
+        """Cancel batch workers for one job or for all jobs"""
+        job_ids = [job_id] if job_id else list(self._batch_tasks)
+        
+        for jid in job_ids:
+            self._queues.pop(jid, None)
+            self._pending_paths.pop(jid, None)
+            task = self._batch_tasks.pop(jid, None)
+            if task is None:
+                continue
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
     
     async def _process_detected_files(
         self,
@@ -155,33 +279,39 @@ class SchedulerService:
         file_paths: List[str]
     ):
         """Process detected files for a job"""
+        # Drop duplicate paths while keeping detection order
+        file_paths = list(dict.fromkeys(file_paths))
         logger.info(f"Processing {len(file_paths)} files for job {job_id}")
         
         async with get_db_context() as db:
-            # Get job configuration
-            result = await db.execute(
-                select(JobDB).where(JobDB.id == job_id)
-            )
-            job = result.scalar_one_or_none()
-            
-            if not job:
-                logger.error(f"Job not found: {job_id}")
-                return
+            # Get job configuration, hitting the DB only on a cache miss
+            job = self._job_cache.get(job_id)
+            if job is None:
+                result = await db.execute(
+                    select(JobDB).where(JobDB.id == job_id)
+                )
+                job = result.scalar_one_or_none()
+                
+                if not job:
+                    logger.error(f"Job not found: {job_id}")
+                    return
             
             # Determine storage type
             storage_type = StorageType(job.storage_type)
             
-            # Create FileInfo objects
+            # Create FileInfo objects (fields are built here, so skip
+            # validation), gathering sizes off the event loop
+            stat_map = await asyncio.to_thread(_stat_paths, file_paths)
             file_infos = []
             for path in file_paths:
-                from pathlib import Path
-                p = Path(path)
-                file_infos.append(FileInfo(
-                    name=p.name,
+                st = stat_map.get(path)
+                name = os.path.basename(path)
+                file_infos.append(FileInfo.model_construct(
+                    name=name,
                     path=path,
-                    size=p.stat().st_size if p.exists() else 0,
+                    size=st.st_size if st else 0,
                     is_dir=False,
-                    extension=p.suffix,
+                    extension=os.path.splitext(name)[1],
                     storage_type=storage_type
                 ))
             
@@ -189,20 +319,22 @@ class SchedulerService:
             # TODO: Determine media type from context or job config
             media_type = MediaType.TV  # Default to TV
             
-            results = await self.recognition_service.recognize_files(
-                file_infos,
-                media_type,
-                db
+            # Recognition is independent per file, so overlap the LLM/TMDB
+            # waits of several chunks. Stride slicing spreads files from the
+            # same directory (likely the same show) across chunks.
+            n = min(len(file_infos), RECOGNITION_CONCURRENCY)
+            chunks = [file_infos[i::n] for i in range(n)]
+            results_per_chunk = await asyncio.gather(
+                *(self._recognize_chunk(chunk, media_type) for chunk in chunks)
             )
+            results = list(itertools.chain.from_iterable(results_per_chunk))
             
             # Filter by confidence threshold
-            threshold = ConfidenceLevel(job.confidence_threshold)
-            threshold_order = {"high": 3, "medium": 2, "low": 1}
-            threshold_val = threshold_order.get(threshold.value, 1)
+            threshold_val = _CONF_RANK[ConfidenceLevel(job.confidence_threshold)]
             
             approved_results = [
                 r for r in results
-                if threshold_order.get(r.confidence.value, 0) >= threshold_val
+                if _CONF_RANK.get(r.confidence, 0) >= threshold_val
             ]
             
             logger.info(f"Job {job_id}: {len(approved_results)}/{len(results)} results meet threshold")
@@ -240,7 +372,67 @@ class SchedulerService:
                     }
                 )
             
-            # Update job last run time
-            job.last_run_at = datetime.utcnow()
-            await db.commit()
+            # Update job last run time in the background
+            self._timestamp_q.put_nowait((job_id, datetime.utcnow()))
+    
+    async def _recognize_chunk(
+        self,
+        file_infos: List[FileInfo],
+        media_type: MediaType
+    ) -> List[RecognitionResult]:
+        """Recognize a chunk of files in its own DB session"""
+        async with get_db_context() as db:
+            return await self.recognition_service.recognize_files(
+                file_infos,
+                media_type,
+                db
+            )
+    
+    def _drain_timestamps(self, latest: Dict[str, datetime]) -> Dict[str, datetime]:
+        """Collect queued timestamps, keeping only the latest per job"""
+        while True:
+            try:
+                job_id, ts = self._timestamp_q.get_nowait()
+            except asyncio.QueueEmpty:
+                return latest
+            latest[job_id] = max(ts, latest.get(job_id, ts))
+    
+    async def _write_timestamps(self, latest: Dict[str, datetime]):
+        """Write last_run_at for several jobs in a single UPDATE"""
+        if not latest:
+            return
+        
+        try:
+            async with get_db_context() as db:
+                await db.execute(
+                    update(JobDB)
+                    .where(JobDB.id.in_(list(latest)))
+                    .values(last_run_at=case(latest, value=JobDB.id))
+                )
+        except Exception as e:
+            logger.error(f"Failed to update job run times: {e}")
+    
+    async def _timestamp_writer(self):
+        """Coalesce queued last_run_at updates and flush them periodically"""
+        while True:
+            job_id, ts = await self._timestamp_q.get()
+            try:
+                await asyncio.sleep(TIMESTAMP_FLUSH_INTERVAL)
+            except asyncio.CancelledError:
+                # Leave it for the final flush on shutdown
+                self._timestamp_q.put_nowait((job_id, ts))
+                raise
+            await self._write_timestamps(self._drain_timestamps({job_id: ts}))
+    
+    async def _stop_timestamp_writer(self):
+        """Stop the timestamp writer and flush anything still queued"""
+        if self._timestamp_task is not None:
+            self._timestamp_task.cancel()
+            try:
+                await self._timestamp_task
+            except asyncio.CancelledError:
+                pass
+            self._timestamp_task = None
+        
+        await self._write_timestamps(self._drain_timestamps({}))
 
@@ -1,28 +1,34 @@
 """
 Watchdog Monitor
-Monitors local filesystem for new files using polling.
+Monitors local filesystem for new files using native events or polling.
 """
 
 import asyncio
 import logging
+import queue
 from typing import Dict, Set, Optional, Callable, Any
 from pathlib import Path
 from datetime import datetime
 
+from watchdog.observers import Observer
+from watchdog.observers.api import BaseObserver
 from watchdog.observers.polling import PollingObserver
 from watchdog.events import FileSystemEventHandler, FileCreatedEvent, FileMovedEvent
 
 from ...core.events import event_bus, EventType
-from ...models.schemas import FileInfo, StorageType
+from ...core.config import settings
+from ...models.schemas import StorageType
 
 logger = logging.getLogger(__name__)
 
 
 # Video extensions to monitor
-VIDEO_EXTENSIONS = {
-    ".mp4", ".mkv", ".avi", ".mov", ".wmv", ".flv", 
+VIDEO_EXTENSIONS = frozenset({
+    ".mp4", ".mkv", ".avi", ".mov", ".wmv", ".flv",
     ".webm", ".m4v", ".ts", ".m2ts"
-}
+})
+# Same extensions as a tuple for str.endswith
+_VIDEO_EXT_SUFFIXES = tuple(VIDEO_EXTENSIONS)
 
 
 class MediaFileHandler(FileSystemEventHandler):
@@ -32,15 +38,24 @@ class MediaFileHandler(FileSystemEventHandler):
         self,
         job_id: str,
         callback: Callable[[str, str], Any],
-        loop: asyncio.AbstractEventLoop
+        loop: asyncio.AbstractEventLoop,
+        events: "queue.SimpleQueue",
+        wake: asyncio.Event
     ):
         self.job_id = job_id
         self.callback = callback
         self.loop = loop
+        self.events = events
+        self.wake = wake
+    
+    def _enqueue(self, event_type: str, path: str):
+        """Hand an event to the monitor's consumer from the observer thread"""
+        self.events.put_nowait((self, event_type, path))
+        self.loop.call_soon_threadsafe(self.wake.set)
     
     def _is_video_file(self, path: str) -> bool:
         """Check if path is a video file"""
-        return Path(path).suffix.lower() in VIDEO_EXTENSIONS
+        return path.lower().endswith(_VIDEO_EXT_SUFFIXES)
     
     def on_created(self, event):
         """Handle file creation"""
@@ -49,10 +64,7 @@ class MediaFileHandler(FileSystemEventHandler):
         
         if self._is_video_file(event.src_path):
             logger.debug(f"New video file: {event.src_path}")
-            asyncio.run_coroutine_threadsafe(
-                self._emit_event("created", event.src_path),
-                self.loop
-            )
+            self._enqueue("created", event.src_path)
     
     def on_moved(self, event):
         """Handle file move"""
@@ -61,28 +73,35 @@ class MediaFileHandler(FileSystemEventHandler):
         
         if self._is_video_file(event.dest_path):
             logger.debug(f"Video file moved: {event.dest_path}")
-            asyncio.run_coroutine_threadsafe(
-                self._emit_event("moved", event.dest_path),
-                self.loop
-            )
+            self._enqueue("moved", event.dest_path)
     
     async def _emit_event(self, event_type: str, path: str):
         """Emit event and call callback"""
-        file_info = FileInfo(
-            name=Path(path).name,
-            path=path,
-            size=Path(path).stat().st_size if Path(path).exists() else 0,
-            is_dir=False,
-            extension=Path(path).suffix,
-            modified_time=datetime.now(),
-            storage_type=StorageType.LOCAL
-        )
+        p = Path(path)
+        try:
+            st = p.stat()
+            size = st.st_size
+            modified_time = datetime.fromtimestamp(st.st_mtime)
+        except OSError:
+            size = 0
+            modified_time = datetime.now()
         
         await event_bus.emit(
             EventType.WATCHDOG_FILE_CREATED if event_type == "created" else EventType.WATCHDOG_FILE_MODIFIED,
             {
                 "job_id": self.job_id,
-                "file_info": file_info.model_dump(),
+                # Laid out as FileInfo.model_dump() would
+                "file_info": {
+                    "name": p.name,
+                    "path": path,
+                    "size": size,
+                    "is_dir": False,
+                    "extension": p.suffix,
+                    "modified_time": modified_time,
+                    "pickcode": None,
+                    "file_id": None,
+                    "storage_type": StorageType.LOCAL
+                },
                 "path": path
             }
         )
@@ -95,16 +114,55 @@ class MediaFileHandler(FileSystemEventHandler):
 class WatchdogMonitor:
     """Monitors local paths for new media files"""
     
-    def __init__(self, on_file_detected: Optional[Callable] = None):
-        self._observers: Dict[str, PollingObserver] = {}
+    def __init__(
+        self,
+        on_file_detected: Optional[Callable] = None,
+        use_polling: Optional[bool] = None
+    ):
+        self._observers: Dict[str, BaseObserver] = {}
         self._running = False
         self._on_file_detected = on_file_detected
+        self._use_polling = (
+            settings.storage.watchdog_use_polling if use_polling is None else use_polling
+        )
+        # Observer threads push (handler, event_type, path) here for one consumer
+        self._events: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._wake: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._consumer_task: Optional[asyncio.Task] = None
+    
+    def _ensure_consumer(self, loop: asyncio.AbstractEventLoop):
+        """Start the event consumer on the given loop if not running"""
+        if self._consumer_task is not None and not self._consumer_task.done():
+            return
+        
+        self._loop = loop
+        self._wake = asyncio.Event()
+        self._consumer_task = loop.create_task(self._consume_events(self._wake))
+    
+    async def _consume_events(self, wake: asyncio.Event):
+        """Drain queued filesystem events, coalescing wake-ups"""
+        while True:
+            await wake.wait()
+            wake.clear()
+            
+            while True:
+                try:
+                    handler, event_type, path = self._events.get_nowait()
+                except queue.Empty:
+                    break
+                
+                try:
+                    await handler._emit_event(event_type, path)
+                except Exception as e:
+                    logger.error(f"Error handling watchdog event for {path}: {e}")
     
     def start_monitoring(
         self,
         job_id: str,
         path: str,
-        poll_interval: int = 60
+        poll_interval: int = 60,
+        use_polling: Optional[bool] = None
     ) -> bool:
         """
         Start monitoring a path.
@@ -112,7 +170,8 @@ class WatchdogMonitor:
         Args:
             job_id: Unique job identifier
             path: Path to monitor
-            poll_interval: Polling interval in seconds
+            poll_interval: Polling interval in seconds (polling observer only)
+            use_polling: Override the monitor's default observer choice
             
         Returns:
             True if started successfully
@@ -132,15 +191,22 @@ class WatchdogMonitor:
             except RuntimeError:
                 loop = asyncio.new_event_loop()
             
+            self._ensure_consumer(loop)
+            
             # Create handler
             handler = MediaFileHandler(
                 job_id=job_id,
                 callback=self._on_file_detected,
-                loop=loop
+                loop=loop,
+                events=self._events,
+                wake=self._wake
             )
             
-            # Create polling observer
-            observer = PollingObserver(timeout=poll_interval)
+            # Native observers (inotify/FSEvents/...) push events; polling
+            # is only needed for mounts that don't deliver them
+            if use_polling is None:
+                use_polling = self._use_polling
+            observer = PollingObserver(timeout=poll_interval) if use_polling else Observer()
             observer.schedule(handler, path, recursive=True)
             observer.start()
             
@@ -188,6 +254,12 @@ class WatchdogMonitor:
             self.stop_monitoring(job_id)
         
         self._running = False
+        
+        # May be called from a worker thread, so cancel via the loop
+        if self._consumer_task is not None and self._loop is not None:
+            if not self._loop.is_closed():
+                self._loop.call_soon_threadsafe(self._consumer_task.cancel)
+            self._consumer_task = None
     
     def is_monitoring(self, job_id: str) -> bool:
         """Check if a job is being monitored"""
@@ -3,12 +3,13 @@ Transfer Service Module
 """
 
 from .service import TransferService
-from .rule_engine import RuleMatchingEngine
+from .rule_engine import RuleMatchingEngine, invalidate_rule_cache
 from .naming_service import NamingService
 
 __all__ = [
     "TransferService",
     "RuleMatchingEngine",
+    "invalidate_rule_cache",
     "NamingService",
 ]
 
@@ -3,10 +3,10 @@ Naming Service
 Generates normalized folder and file names based on patterns and TMDB metadata.
 """
 
-import re
 import logging
-from typing import Optional, Dict, Any
-from pathlib import PurePosixPath
+import string
+from functools import lru_cache
+from typing import Optional, Dict, Any, FrozenSet
 
 from pypinyin import lazy_pinyin, Style
 
@@ -19,6 +19,19 @@ logger = logging.getLogger(__name__)
 # Characters that are invalid in filenames (for different OS)
 INVALID_CHARS = r'[<>:"/\\|?*]'
 
+# Full-width replacements for the invalid characters, applied in one pass
+_INVALID_TRANS = str.maketrans({
+    ":": "：",
+    "/": "／",
+    "\\": "＼",
+    "?": "？",
+    "*": "＊",
+    "<": "＜",
+    ">": "＞",
+    "|": "｜",
+    '"': "＂",
+})
+
 # Default naming patterns (Emby standard)
 DEFAULT_MOVIE_FOLDER = "{title} ({year}) {{tmdb-{tmdb_id}}}"
 DEFAULT_MOVIE_FILE = "{title} ({year}){version}{ext}"
@@ -27,11 +40,45 @@ DEFAULT_TV_SEASON_FOLDER = "Season {season:02d}"
 DEFAULT_TV_EPISODE_FILE = "{title} - S{season:02d}E{episode:02d}{ext}"
 
 
+class _SafeDict(dict):
+    """Context mapping that renders unknown template fields as empty"""
+    
+    def __missing__(self, key: str) -> str:
+        return ""
+
+
+@lru_cache(maxsize=8192)
+def _cjk_first_letter(char: str) -> str:
+    """Get the uppercase pinyin initial of a CJK character"""
+    pinyin = lazy_pinyin(char, style=Style.FIRST_LETTER)
+    return pinyin[0].upper() if pinyin else ""
+
+
+@lru_cache(maxsize=128)
+def _template_fields(template: str) -> FrozenSet[str]:
+    """Get the field names a template references"""
+    try:
+        return frozenset(
+            field.split(".", 1)[0].split("[", 1)[0]
+            for _, field, _, _ in string.Formatter().parse(template)
+            if field
+        )
+    except ValueError:
+        return frozenset()
+
+
+@lru_cache(maxsize=64)
+def _multi_episode_template(template: str) -> str:
+    """Swap the single episode placeholder for the episode range"""
+    return template.replace("E{episode:02d}", "{episode_range}")
+
+
 class NamingService:
     """Service for generating normalized media names"""
     
     def __init__(self):
         self.presets = settings.naming_presets
+        self._pattern_cache: Dict[str, Dict[str, str]] = {}
     
     def generate_names(
         self,
@@ -56,42 +103,53 @@ class NamingService:
         media_info = result.media_info
         
         # Get pattern
-        pattern = self._get_pattern(
-            pattern_name or "emby_standard",
-            media_info.media_type
-        )
+        pattern = self._get_pattern(pattern_name or "emby_standard")
+        
+        # Generate names
+        if media_info.media_type == MediaType.MOVIE:
+            keys = ("movie_folder", "movie_file")
+        else:
+            keys = ("tv_folder", "tv_season_folder", "tv_episode_file")
+        fields = frozenset().union(*(_template_fields(pattern[key]) for key in keys))
         
         # Build context for substitution
-        context = self._build_context(result, version_tag)
+        context = self._build_context(result, version_tag, fields)
         
-        # Generate names
         if media_info.media_type == MediaType.MOVIE:
             return self._generate_movie_names(pattern, context)
         else:
             return self._generate_tv_names(pattern, context)
     
-    def _get_pattern(
-        self,
-        pattern_name: str,
-        media_type: MediaType
-    ) -> Dict[str, str]:
-        """Get naming pattern by name"""
+    def _get_pattern(self, pattern_name: str) -> Dict[str, str]:
+        """Get naming pattern by name (resolved once per name)"""
+        pattern = self._pattern_cache.get(pattern_name)
+        if pattern is not None:
+            return pattern
+        
         preset = self.presets.get(pattern_name, self.presets.get("emby_standard", {}))
         
-        return {
+        pattern = {
             "movie_folder": preset.get("movie_folder", DEFAULT_MOVIE_FOLDER),
             "movie_file": preset.get("movie_file", DEFAULT_MOVIE_FILE),
             "tv_folder": preset.get("tv_folder", DEFAULT_TV_FOLDER),
             "tv_season_folder": preset.get("tv_season_folder", DEFAULT_TV_SEASON_FOLDER),
             "tv_episode_file": preset.get("tv_episode_file", DEFAULT_TV_EPISODE_FILE),
         }
+        self._pattern_cache[pattern_name] = pattern
+        return pattern
     
     def _build_context(
         self,
         result: RecognitionResult,
-        version_tag: Optional[str] = None
+        version_tag: Optional[str] = None,
+        fields: Optional[FrozenSet[str]] = None
     ) -> Dict[str, Any]:
-        """Build substitution context from recognition result"""
+        """
+        Build substitution context from recognition result.
+        
+        Derived fields (first_letter, decade) are only computed when listed
+        in fields, or always if fields is None.
+        """
         media_info = result.media_info
         file_info = result.file_info
         
@@ -121,16 +179,18 @@ class NamingService:
             "ext": ext,
             
             # TV specific
-            "season": media_info.season or 1,
-            "episode": media_info.episode or 1,
-            "end_episode": media_info.end_episode,
+            "season": int(media_info.season or 1),
+            "episode": int(media_info.episode or 1),
+            "end_episode": media_info.end_episode or "",
             "episode_title": media_info.episode_title or "",
-            
-            # Derived fields
-            "first_letter": self._get_first_letter(media_info.title or ""),
-            "decade": f"{(media_info.year // 10) * 10}s" if media_info.year else "Unknown",
         }
         
+        # Derived fields
+        if fields is None or "first_letter" in fields:
+            context["first_letter"] = self._get_first_letter(media_info.title or "")
+        if fields is None or "decade" in fields:
+            context["decade"] = f"{(media_info.year // 10) * 10}s" if media_info.year else "Unknown"
+        
         return context
     
     def _generate_movie_names(
@@ -163,7 +223,7 @@ class NamingService:
             # Replace episode placeholder with range
             context["episode_range"] = f"E{context['episode']:02d}-E{context['end_episode']:02d}"
             file_name = self._substitute(
-                episode_pattern.replace("E{episode:02d}", "{episode_range}"),
+                _multi_episode_template(episode_pattern),
                 context
             )
         else:
@@ -176,42 +236,21 @@ class NamingService:
         }
     
     def _substitute(self, template: str, context: Dict[str, Any]) -> str:
-        """Substitute template variables"""
-        result = template
-        
-        # Handle format specifiers like {season:02d}
-        for key, value in context.items():
-            # Simple substitution {key}
-            result = result.replace(f"{{{key}}}", str(value) if value is not None else "")
-            
-            # With format specifier {key:format}
-            pattern = rf"\{{{key}:([^}}]+)\}}"
-            match = re.search(pattern, result)
-            if match:
-                fmt = match.group(1)
-                try:
-                    formatted = f"{{:{fmt}}}".format(value)
-                    result = re.sub(pattern, formatted, result)
-                except (ValueError, KeyError):
-                    result = re.sub(pattern, str(value), result)
-        
-        return result
+        """Substitute template variables (str.format syntax, e.g. {season:02d})"""
+        try:
+            return template.format_map(_SafeDict(context))
+        except (ValueError, TypeError, IndexError, AttributeError) as e:
+            logger.warning(f"Invalid naming template {template!r}: {e}")
+            return template
     
     def _clean_name(self, name: str) -> str:
         """Clean name for filesystem compatibility"""
-        # Replace invalid characters with full-width equivalents or remove
-        name = name.replace(":", "：")
-        name = name.replace("/", "／")
-        name = name.replace("\\", "＼")
-        name = name.replace("?", "？")
-        name = name.replace("*", "＊")
-        name = name.replace("<", "＜")
-        name = name.replace(">", "＞")
-        name = name.replace("|", "｜")
-        name = name.replace('"', "＂")
+        # Replace invalid characters with full-width equivalents
+        name = name.translate(_INVALID_TRANS)
         
-        # Remove multiple spaces
-        name = re.sub(r"\s+", " ", name)
+        # Collapse whitespace; only runs of spaces or tabs/newlines need it
+        if "  " in name or not name.isprintable():
+            name = " ".join(name.split())
         
         # Trim spaces and dots from ends
         name = name.strip(" .")
@@ -228,9 +267,9 @@ class NamingService:
         # Check if Chinese character
         if '\u4e00' <= first_char <= '\u9fff':
             # Get pinyin and take first letter
-            pinyin = lazy_pinyin(first_char, style=Style.FIRST_LETTER)
-            if pinyin:
-                return pinyin[0].upper()
+            letter = _cjk_first_letter(first_char)
+            if letter:
+                return letter
         
         # ASCII letter
         if first_char.isalpha():
@@ -275,7 +314,7 @@ class NamingService:
         """
         names = self.generate_names(result, pattern_name, version_tag)
         
-        path_parts = [base_path, names["folder_name"]]
+        path_parts = [names["folder_name"]]
         
         if result.media_info and result.media_info.media_type == MediaType.TV:
             if "season_folder" in names:
@@ -283,5 +322,10 @@ class NamingService:
         
         path_parts.append(names["file_name"])
         
-        return str(PurePosixPath(*path_parts))
+        # Cleaned names can't contain "/", so a plain join is enough
+        tail = "/".join(part for part in path_parts if part)
+        base = base_path.rstrip("/")
+        if base or base_path.startswith("/"):
+            return f"{base}/{tail}"
+        return tail
 
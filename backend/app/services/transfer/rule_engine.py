@@ -4,8 +4,10 @@ Matches recognition results against configured transfer rules.
 """
 
 import re
+import time
 import logging
-from typing import List, Optional, Dict, Any
+from functools import lru_cache
+from typing import List, Optional, Dict, Any, Tuple
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
@@ -51,18 +53,87 @@ GENRE_MAP = {
     10752: "War",
 }
 
+_GENRE_GET = GENRE_MAP.get
+
+# Case-insensitive operators; they receive field values lowercased up front
+_CASE_FOLDED_OPS = frozenset({"equals", "contains", "in"})
+
+
+# Regex metacharacters; "matches" patterns without them are plain substrings
+_REGEX_META = re.compile(r"[.^$*+?()\[\]{}|\\]")
+
+# Relative evaluation cost per operator; cheaper conditions run first so
+# a failing one skips the expensive ones (all conditions are ANDed)
+_OPERATOR_COST = {
+    "equals": 0,
+    "in": 1,
+    "gte": 1,
+    "lte": 1,
+    "between": 2,
+    "contains": 3,
+    "matches": 4,
+}
+
+# Seconds a loaded rule set stays cached; writes through the rules API
+# invalidate it immediately
+RULE_CACHE_TTL = 30.0
+
+# (storage_type, media_type) -> (loaded_at, rules in priority order)
+_rule_cache: Dict[Tuple[str, str], Tuple[float, List[TransferRule]]] = {}
+
+
+def invalidate_rule_cache():
+    """Drop cached rule sets after rules are created, updated or deleted"""
+    _rule_cache.clear()
+
+
+def _lower_value(value: Any) -> Any:
+    """Lowercase a string or list field value, leaving other values as-is"""
+    if isinstance(value, str):
+        return value.lower()
+    if isinstance(value, list):
+        return [str(v).lower() for v in value]
+    return value
+
+
+def _lower_set(values: Any) -> frozenset:
+    """Lowercased string set of a value or list of values"""
+    if not isinstance(values, (list, tuple, set, frozenset)):
+        values = [values]
+    return frozenset(str(v).lower() for v in values)
+
+
+@lru_cache(maxsize=512)
+def _compile_ci(pattern: str) -> Optional[re.Pattern]:
+    """Compile a case-insensitive rule pattern, or None if it is invalid"""
+    try:
+        return re.compile(pattern, re.IGNORECASE)
+    except re.error:
+        logger.warning(f"Invalid regex pattern: {pattern}")
+        return None
+
 
 class RuleMatchingEngine:
     """Engine for matching recognition results to transfer rules"""
     
     def __init__(self):
-        pass
+        # Operator -> check taking (field_value, operand)
+        self._ops = {
+            "equals": self._equals,
+            "contains": self._contains,
+            "in": self._in_list,
+            "matches": self._matches,
+            "between": self._between,
+            "gte": self._gte,
+            "lte": self._lte,
+        }
     
     async def match_rule(
         self,
         result: RecognitionResult,
         storage_type: StorageType,
-        db: AsyncSession
+        db: AsyncSession,
+        index: Optional[Dict[MediaType, List[TransferRule]]] = None
     ) -> Optional[TransferRule]:
         """
         Find the best matching rule for a recognition result.
@@ -75,6 +146,7 @@ class RuleMatchingEngine:
             result: Recognition result to match
             storage_type: Source storage type
             db: Database session
+            index: Optional rules from build_index, skipping the rule lookup
             
         Returns:
             Matching TransferRule or None
@@ -83,6 +155,72 @@ class RuleMatchingEngine:
             return None
         
         media_type = result.media_info.media_type
+        if index is not None:
+            rules = index.get(media_type, [])
+        else:
+            rules = await self._load_rules(storage_type, media_type, db)
+        
+        # Resolve field values once for all rules
+        values = self._field_values(result)
+        
+        # Evaluate each rule
+        for rule in rules:
+            if self._evaluate_rule(rule, values):
+                logger.debug(f"Matched rule: {rule.name} for {result.file_info.name}")
+                return rule
+        
+        return None
+    
+    async def build_index(
+        self,
+        storage_type: StorageType,
+        db: AsyncSession
+    ) -> Dict[MediaType, List[TransferRule]]:
+        """
+        Load all enabled rules for a storage type in one query.
+        
+        Args:
+            storage_type: Source storage type
+            db: Database session
+            
+        Returns:
+            Rules in priority order, bucketed by the media type they apply to
+        """
+        query = select(TransferRuleDB).where(
+            TransferRuleDB.enabled == True
+        ).where(
+            (TransferRuleDB.storage_type == storage_type.value) |
+            (TransferRuleDB.storage_type == "all")
+        ).order_by(TransferRuleDB.priority)
+        
+        db_result = await db.execute(query)
+        rules = [self._db_to_schema(rule_db) for rule_db in db_result.scalars().all()]
+        
+        index = {
+            media_type: [r for r in rules if r.media_type in (media_type.value, "all")]
+            for media_type in MediaType
+        }
+        
+        # Refresh the per-type cache with the same buckets
+        now = time.monotonic()
+        for media_type, bucket in index.items():
+            _rule_cache[(storage_type.value, media_type.value)] = (now, bucket)
+        
+        return index
+    
+    async def _load_rules(
+        self,
+        storage_type: StorageType,
+        media_type: MediaType,
+        db: AsyncSession
+    ) -> List[TransferRule]:
+        """Get enabled rules for a storage/media type, cached for RULE_CACHE_TTL"""
+        key = (storage_type.value, media_type.value)
+        now = time.monotonic()
+        
+        cached = _rule_cache.get(key)
+        if cached and now - cached[0] < RULE_CACHE_TTL:
+            return cached[1]
         
         # Query applicable rules
         query = select(TransferRuleDB).where(
@@ -96,27 +234,33 @@ class RuleMatchingEngine:
         ).order_by(TransferRuleDB.priority)
         
         db_result = await db.execute(query)
-        rules = db_result.scalars().all()
-        
-        # Evaluate each rule
-        for rule_db in rules:
-            rule = self._db_to_schema(rule_db)
-            
-            if self._evaluate_rule(rule, result):
-                logger.debug(f"Matched rule: {rule.name} for {result.file_info.name}")
-                return rule
+        rules = [self._db_to_schema(rule_db) for rule_db in db_result.scalars().all()]
         
-        return None
+        _rule_cache[key] = (now, rules)
+        return rules
     
     def _db_to_schema(self, db_rule: TransferRuleDB) -> TransferRule:
         """Convert database rule to schema"""
         conditions = []
         for cond_data in db_rule.conditions or []:
-            conditions.append(RuleCondition(
+            condition = RuleCondition(
                 field=cond_data.get("field", ""),
                 operator=cond_data.get("operator", ""),
                 value=cond_data.get("value")
-            ))
+            )
+            # Compile regexes once when the rule is loaded, or skip the
+            # regex engine entirely for literal patterns
+            if condition.operator == "matches":
+                pattern = str(condition.value)
+                if _REGEX_META.search(pattern):
+                    condition._prepared = _compile_ci(pattern)
+                else:
+                    condition._literal = pattern.lower()
+            elif condition.operator == "in":
+                condition._prepared = _lower_set(condition.value)
+            conditions.append(condition)
+        
+        conditions.sort(key=self._condition_cost)
         
         return TransferRule(
             id=db_rule.id,
@@ -130,10 +274,16 @@ class RuleMatchingEngine:
             enabled=db_rule.enabled
         )
     
+    def _condition_cost(self, condition: RuleCondition) -> int:
+        """Get evaluation cost of a condition (literal patterns cost a substring check)"""
+        if condition.operator == "matches" and condition._literal is not None:
+            return _OPERATOR_COST["contains"]
+        return _OPERATOR_COST.get(condition.operator, len(_OPERATOR_COST))
+    
     def _evaluate_rule(
         self,
         rule: TransferRule,
-        result: RecognitionResult
+        values: Dict[str, Tuple[Any, Any]]
     ) -> bool:
         """
         Evaluate if a rule matches a recognition result.
@@ -144,7 +294,7 @@ class RuleMatchingEngine:
             return True
         
         for condition in rule.conditions:
-            if not self._evaluate_condition(condition, result):
+            if not self._evaluate_condition(condition, values):
                 return False
         
         return True
@@ -152,125 +302,103 @@ class RuleMatchingEngine:
     def _evaluate_condition(
         self,
         condition: RuleCondition,
-        result: RecognitionResult
+        values: Dict[str, Tuple[Any, Any]]
     ) -> bool:
         """Evaluate a single condition"""
-        field = condition.field
-        operator = condition.operator
-        value = condition.value
-        
-        # Get field value from result
-        field_value = self._get_field_value(field, result)
+        # Get the pre-resolved (raw, lowercased) field value
+        field_value, lowered = values.get(condition.field, (None, None))
         
         if field_value is None:
             return False
         
+        # Literal regex patterns are plain substring checks
+        if condition._literal is not None:
+            if isinstance(lowered, (str, list)):
+                return self._contains(lowered, condition._literal)
+            return condition._literal in str(field_value).lower()
+        
         # Evaluate based on operator
-        if operator == "equals":
-            return self._equals(field_value, value)
-        elif operator == "contains":
-            return self._contains(field_value, value)
-        elif operator == "in":
-            return self._in_list(field_value, value)
-        elif operator == "matches":
-            return self._matches(field_value, value)
-        elif operator == "between":
-            return self._between(field_value, value)
-        elif operator == "gte":
-            return self._gte(field_value, value)
-        elif operator == "lte":
-            return self._lte(field_value, value)
-        else:
+        operator = condition.operator
+        op = self._ops.get(operator)
+        if op is None:
             logger.warning(f"Unknown operator: {operator}")
             return False
+        
+        prepared = condition._prepared
+        return op(
+            lowered if operator in _CASE_FOLDED_OPS else field_value,
+            condition.value if prepared is None else prepared
+        )
     
-    def _get_field_value(
-        self,
-        field: str,
-        result: RecognitionResult
-    ) -> Any:
-        """Get field value from recognition result"""
+    def _field_values(self, result: RecognitionResult) -> Dict[str, Tuple[Any, Any]]:
+        """
+        Resolve every rule field from a recognition result.
+        
+        Each field maps to its raw and lowercased value. Fields missing
+        here (network, rating - not in the basic TMDB response) evaluate
+        as None, which fails any condition.
+        """
         media_info = result.media_info
         tmdb_info = media_info.tmdb_info if media_info else None
+        year = media_info.year if media_info else None
         
-        if field == "genre":
-            if tmdb_info and tmdb_info.genre_ids:
-                # Convert genre IDs to names
-                return [GENRE_MAP.get(gid, str(gid)) for gid in tmdb_info.genre_ids]
-            return []
-        
-        elif field == "country":
-            if tmdb_info and tmdb_info.origin_country:
-                return tmdb_info.origin_country
-            return []
-        
-        elif field == "language":
-            if tmdb_info:
-                return tmdb_info.original_language
-            return None
-        
-        elif field == "year" or field == "year_range":
-            if media_info:
-                return media_info.year
-            return None
+        genre_ids = tmdb_info.genre_ids if tmdb_info else None
         
-        elif field == "keyword":
+        values = {
+            # Convert genre IDs to names
+            "genre": [_GENRE_GET(gid) or str(gid) for gid in genre_ids] if genre_ids else [],
+            "country": (tmdb_info.origin_country if tmdb_info else None) or [],
+            "language": tmdb_info.original_language if tmdb_info else None,
+            "year": year,
+            "year_range": year,
             # Check filename for keywords
-            return result.file_info.name
+            "keyword": result.file_info.name,
+        }
         
-        elif field == "network":
-            # Network info would come from TMDB details (for TV)
-            # Not implemented in basic TMDB response
-            return None
-        
-        elif field == "rating":
-            # TMDB rating - not in basic response
-            return None
-        
-        return None
+        return {field: (value, _lower_value(value)) for field, value in values.items()}
     
     def _equals(self, field_value: Any, expected: Any) -> bool:
-        """Check equality"""
+        """Check equality (field_value is already lowercased)"""
         if isinstance(field_value, str):
-            return field_value.lower() == str(expected).lower()
+            return field_value == str(expected).lower()
+        if isinstance(field_value, list) and isinstance(expected, list):
+            return field_value == [str(v).lower() for v in expected]
         return field_value == expected
     
     def _contains(self, field_value: Any, search: Any) -> bool:
-        """Check if field contains value"""
+        """Check if field contains value (field_value is already lowercased)"""
         search_str = str(search).lower()
         
         if isinstance(field_value, list):
-            return any(search_str in str(v).lower() for v in field_value)
+            return any(search_str in v for v in field_value)
         
         if isinstance(field_value, str):
-            return search_str in field_value.lower()
+            return search_str in field_value
         
         return False
     
     def _in_list(self, field_value: Any, allowed: Any) -> bool:
-        """Check if field value is in allowed list"""
-        if not isinstance(allowed, list):
-            allowed = [allowed]
-        
-        allowed_lower = [str(a).lower() for a in allowed]
+        """
+        Check if field value is in allowed list (or a prepared lowercased set).
+        field_value is already lowercased.
+        """
+        if not isinstance(allowed, frozenset):
+            allowed = _lower_set(allowed)
         
         if isinstance(field_value, list):
-            return any(str(v).lower() in allowed_lower for v in field_value)
+            return any(v in allowed for v in field_value)
         
-        return str(field_value).lower() in allowed_lower
+        return str(field_value) in allowed
     
     def _matches(self, field_value: Any, pattern: Any) -> bool:
-        """Check if field matches regex pattern"""
-        try:
-            if isinstance(field_value, list):
-                return any(
-                    re.search(str(pattern), str(v), re.IGNORECASE)
-                    for v in field_value
-                )
-            return bool(re.search(str(pattern), str(field_value), re.IGNORECASE))
-        except re.error:
-            logger.warning(f"Invalid regex pattern: {pattern}")
+        """Check if field matches regex pattern (raw or precompiled)"""
+        rx = pattern if isinstance(pattern, re.Pattern) else _compile_ci(str(pattern))
+        if rx is None:
             return False
+        
+        if isinstance(field_value, list):
+            return any(rx.search(str(v)) for v in field_value)
+        return bool(rx.search(str(field_value)))
     
     def _between(self, field_value: Any, range_val: Any) -> bool:
         """Check if field is between two values"""
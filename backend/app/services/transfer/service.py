@@ -3,10 +3,14 @@ Transfer Service
 Handles file transfer operations with rule matching and naming.
 """
 
+import asyncio
 import logging
-from typing import List, Optional, Dict, Any
+import re
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import List, Optional, Dict, Any, Set, Tuple
 from datetime import datetime
-from pathlib import PurePosixPath
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -14,16 +18,138 @@ from .rule_engine import RuleMatchingEngine
 from .naming_service import NamingService
 from ...models.schemas import (
     RecognitionResult, TransferRule, TransferTask, TransferStatus,
-    StorageType, MediaType, DryRunReport
+    StorageType, MediaType, ConfidenceLevel, DryRunReport
 )
 from ...models.db_models import TransferHistoryDB
-from ...vfs import get_vfs_adapter, VFSError
+from ...vfs import get_vfs_adapter, VFSAdapter, VFSError
 from ...core.events import event_bus, EventType
 from ...core.config import settings
 
 logger = logging.getLogger(__name__)
 
 
+# History rows are flushed in chunks of this size before the final commit
+HISTORY_FLUSH_SIZE = 200
+
+# Concurrent season folder preparations per storage type (115 is rate limited)
+SEASON_PREP_CONCURRENCY = {
+    StorageType.P115: 4,
+    StorageType.WEBDAV: 8,
+    StorageType.LOCAL: 16,
+}
+
+
+# Variables a rule's target_path template may use
+_PATH_VARIABLES = ("title", "year", "tmdb_id", "quality", "season")
+
+_PATH_VARIABLE_RE = re.compile(r"\{(\w+)\}")
+
+
+@lru_cache(maxsize=256)
+def _template_segments(template: str) -> Tuple[Tuple[Tuple[str, Optional[str]], ...], str]:
+    """
+    Parse a path template once into (literal, variable) segments.
+    
+    Unknown {names} stay part of the literal text; returns the segments
+    and the trailing literal.
+    """
+    segments = []
+    literal = []
+    pos = 0
+    for m in _PATH_VARIABLE_RE.finditer(template):
+        literal.append(template[pos:m.start()])
+        pos = m.end()
+        if m.group(1) in _PATH_VARIABLES:
+            segments.append(("".join(literal), m.group(1)))
+            literal = []
+        else:
+            literal.append(m.group(0))
+    literal.append(template[pos:])
+    return tuple(segments), "".join(literal)
+
+
+@lru_cache(maxsize=4096)
+def _render_path_template(
+    template: str,
+    title: str,
+    year: str,
+    tmdb_id: str,
+    quality: str,
+    season: str
+) -> str:
+    """Substitute path template variables (cached; episodes share inputs)"""
+    subs = {
+        "title": title,
+        "year": year,
+        "tmdb_id": tmdb_id,
+        "quality": quality,
+        "season": season,
+    }
+    
+    segments, tail = _template_segments(template)
+    return "".join([lit + subs[var] for lit, var in segments]) + tail
+
+
+@dataclass
+class TransferSession:
+    """State shared by the items of one transfer request"""
+    # History row mappings, saved once at the end
+    rows: List[Dict[str, Any]] = field(default_factory=list)
+    # Directories known to exist on the target (including parents)
+    created_dirs: Set[str] = field(default_factory=set)
+    
+    async def ensure_dir(self, adapter: VFSAdapter, path: str) -> None:
+        """Create a directory unless this session already did"""
+        if path in self.created_dirs:
+            return
+        
+        await adapter.mkdir(path, parents=True)
+        
+        # mkdir(parents=True) made every ancestor too
+        while path and path not in self.created_dirs:
+            self.created_dirs.add(path)
+            path = path.rpartition("/")[0]
+
+
+def _leaf_dirs(paths) -> List[str]:
+    """Drop directories that are ancestors of others (mkdir with parents covers them)"""
+    covered: Set[str] = set()
+    leaves = []
+    for path in sorted(set(paths), key=len, reverse=True):
+        if path in covered:
+            continue
+        leaves.append(path)
+        while path:
+            path = path.rpartition("/")[0]
+            covered.add(path or "/")
+    return leaves
+
+
+def _join_path(base: str, *parts: str) -> str:
+    """Join POSIX path parts onto a base (parts hold no separators)"""
+    tail = "/".join(parts)
+    stripped = base.rstrip("/")
+    if stripped or base.startswith("/"):
+        return f"{stripped}/{tail}"
+    return tail
+
+
+def _naming_fingerprint(result: RecognitionResult) -> Tuple:
+    """Key of every recognition field that naming templates can use"""
+    media_info = result.media_info
+    if not media_info:
+        return (result.file_info.name,)
+    
+    return (
+        media_info.media_type, media_info.title, media_info.original_title,
+        media_info.year, media_info.tmdb_id, media_info.season,
+        media_info.episode, media_info.end_episode, media_info.episode_title,
+        media_info.quality, media_info.source, media_info.codec,
+        media_info.audio, media_info.release_group,
+        result.file_info.extension,
+    )
+
+
 class TransferService:
     """Service for transferring media files"""
     
@@ -51,14 +177,21 @@ class TransferService:
         processed_results = []
         errors = []
         
-        high_count = 0
-        medium_count = 0
-        low_count = 0
+        confidence_counts: Counter = Counter()
+        recognized_count = 0
+        
+        # Names for this report, keyed by (pattern, fingerprint)
+        name_cache: Dict[Tuple, Dict[str, str]] = {}
+        
+        # Load the rules once for the whole report
+        rule_index = await self.rule_engine.build_index(storage_type, db)
         
         for result in results:
             try:
                 # Match rule
-                rule = await self.rule_engine.match_rule(result, storage_type, db)
+                rule = await self.rule_engine.match_rule(
+                    result, storage_type, db, index=rule_index
+                )
                 
                 if rule:
                     result.matched_rule_id = rule.id
@@ -70,25 +203,29 @@ class TransferService:
                         result
                     )
                     
-                    # Generate normalized names
-                    names = self.naming_service.generate_names(
-                        result,
-                        pattern_name=rule.naming_pattern
+                    # Generate normalized names (reused across duplicates,
+                    # unless the user edited this item by hand)
+                    key = None if result.user_override else (
+                        rule.naming_pattern, _naming_fingerprint(result)
                     )
+                    names = name_cache.get(key) if key else None
+                    if names is None:
+                        names = self.naming_service.generate_names(
+                            result,
+                            pattern_name=rule.naming_pattern
+                        )
+                        if key:
+                            name_cache[key] = names
                     
                     result.target_path = target_path
                     result.target_folder_name = names.get("folder_name")
                     result.target_file_name = names.get("file_name")
                 
                 # Count confidence levels
-                confidence = result.confidence.value
-                if confidence == "high":
-                    high_count += 1
-                elif confidence == "medium":
-                    medium_count += 1
-                else:
-                    low_count += 1
+                confidence_counts[result.confidence] += 1
                 
+                if result.media_info:
+                    recognized_count += 1
                 processed_results.append(result)
                 
             except Exception as e:
@@ -100,10 +237,10 @@ class TransferService:
         
         return DryRunReport(
             total_items=len(results),
-            recognized_items=len([r for r in processed_results if r.media_info]),
-            high_confidence=high_count,
-            medium_confidence=medium_count,
-            low_confidence=low_count,
+            recognized_items=recognized_count,
+            high_confidence=confidence_counts[ConfidenceLevel.HIGH],
+            medium_confidence=confidence_counts[ConfidenceLevel.MEDIUM],
+            low_confidence=confidence_counts[ConfidenceLevel.LOW],
             items=processed_results,
             errors=errors
         )
@@ -139,88 +276,71 @@ class TransferService:
         # Get VFS adapter
         adapter = get_vfs_adapter(storage_type)
         
+        # Load the override rule once for all items
+        override_rule = None
+        if global_rule_override:
+            from ...models.db_models import TransferRuleDB
+            from sqlalchemy import select
+            
+            result = await db.execute(
+                select(TransferRuleDB).where(TransferRuleDB.id == global_rule_override)
+            )
+            override_rule = result.scalar_one_or_none()
+        
+        # Moves run concurrently; history rows are written once at the end
+        sem = asyncio.Semaphore(settings.storage.transfer_concurrency)
+        session = TransferSession()
+        
+        # Resolve every target first (keeping errors for _transfer_one)
+        targets: List[Any] = []
         for item in items:
             try:
-                # Get rule
-                if global_rule_override:
-                    # Load rule by ID
-                    from ...models.db_models import TransferRuleDB
-                    from sqlalchemy import select
-                    
-                    result = await db.execute(
-                        select(TransferRuleDB).where(TransferRuleDB.id == global_rule_override)
-                    )
-                    rule_db = result.scalar_one_or_none()
-                    
-                    if rule_db:
-                        item.matched_rule_id = rule_db.id
-                        item.matched_rule_name = rule_db.name
-                        item.target_path = self._substitute_path_template(
-                            rule_db.target_path,
-                            item
-                        )
-                
-                if not item.target_path:
-                    raise ValueError("No target path determined")
-                
-                # Generate full target path with file name
-                names = self.naming_service.generate_names(item)
-                target_file_path = self._build_full_target_path(
-                    item.target_path,
-                    names,
-                    item.media_info.media_type if item.media_info else MediaType.UNKNOWN
-                )
-                
-                # Execute transfer
-                source_path = item.file_info.path
-                
-                # Ensure target directory exists
-                target_dir = str(PurePosixPath(target_file_path).parent)
-                await adapter.mkdir(target_dir, parents=True)
-                
-                # Move file (default: overwrite)
-                await adapter.move(source_path, target_file_path, overwrite=True)
-                
-                # Record in history
-                await self._record_transfer(
-                    db,
-                    item,
-                    source_path,
-                    target_file_path,
-                    storage_type,
-                    TransferStatus.COMPLETED
-                )
-                
-                success_count += 1
-                
-                await event_bus.emit(
-                    EventType.TRANSFER_PROGRESS,
-                    {
-                        "current": success_count + failed_count,
-                        "total": len(items),
-                        "file": item.file_info.name
-                    }
-                )
-                
+                targets.append(self._resolve_target(item, override_rule))
             except Exception as e:
-                logger.error(f"Transfer failed for {item.file_info.name}: {e}")
-                failed_count += 1
-                errors.append({
-                    "file": item.file_info.name,
-                    "error": str(e)
-                })
-                
-                # Record failure
-                await self._record_transfer(
-                    db,
-                    item,
-                    item.file_info.path,
-                    item.target_path or "",
-                    storage_type,
-                    TransferStatus.FAILED,
-                    str(e)
+                targets.append(e)
+        
+        # Create each distinct target directory once, up front. Failures
+        # are left for the item's own ensure_dir to retry and report
+        async def make_dir(path: str):
+            async with sem:
+                await session.ensure_dir(adapter, path)
+        
+        target_dirs = _leaf_dirs(
+            t.rpartition("/")[0] or "/" for t in targets if isinstance(t, str)
+        )
+        await asyncio.gather(*map(make_dir, target_dirs), return_exceptions=True)
+        
+        async def run(item: RecognitionResult, target: Any):
+            nonlocal success_count, failed_count
+            async with sem:
+                error = await self._transfer_one(
+                    item, target, adapter, storage_type, session
                 )
+            
+            if error is not None:
+                failed_count += 1
+                errors.append({"file": item.file_info.name, "error": error})
+                return
+            
+            # Progress is informational; don't hold up the transfer for it
+            success_count += 1
+            event_bus.emit_nowait(
+                EventType.TRANSFER_PROGRESS,
+                {
+                    "current": success_count + failed_count,
+                    "total": len(items),
+                    "file": item.file_info.name
+                }
+            )
+        
+        try:
+            await asyncio.gather(*map(run, items, targets))
+        finally:
+            # Keep partial progress even if the transfer is cancelled
+            await self._save_history(db, session.rows)
         
+        # Deliver outstanding progress events before completion
+        await event_bus.drain()
         await event_bus.emit(
             EventType.TRANSFER_COMPLETED,
             {
@@ -236,6 +356,82 @@ class TransferService:
             "errors": errors
         }
     
+    def _resolve_target(
+        self,
+        item: RecognitionResult,
+        override_rule: Optional[Any] = None
+    ) -> str:
+        """Apply the override rule, if any, and build the item's target file path"""
+        if override_rule:
+            item.matched_rule_id = override_rule.id
+            item.matched_rule_name = override_rule.name
+            item.target_path = self._substitute_path_template(
+                override_rule.target_path,
+                item
+            )
+        
+        if not item.target_path:
+            raise ValueError("No target path determined")
+        
+        # Generate full target path with file name
+        names = self.naming_service.generate_names(item)
+        return self._build_full_target_path(
+            item.target_path,
+            names,
+            item.media_info.media_type if item.media_info else MediaType.UNKNOWN
+        )
+    
+    async def _transfer_one(
+        self,
+        item: RecognitionResult,
+        target: Any,
+        adapter: VFSAdapter,
+        storage_type: StorageType,
+        session: TransferSession
+    ) -> Optional[str]:
+        """
+        Move a single item and record it; returns the error message on failure.
+        target is the path from _resolve_target, or the exception it raised.
+        """
+        try:
+            if isinstance(target, Exception):
+                raise target
+            target_file_path = target
+            
+            # Execute transfer
+            source_path = item.file_info.path
+            
+            # Ensure target directory exists
+            target_dir = target_file_path.rpartition("/")[0] or "/"
+            await session.ensure_dir(adapter, target_dir)
+            
+            # Move file (default: overwrite)
+            await adapter.move(source_path, target_file_path, overwrite=True)
+            
+            # Record in history
+            session.rows.append(self._record_transfer(
+                item,
+                source_path,
+                target_file_path,
+                storage_type,
+                TransferStatus.COMPLETED
+            ))
+            return None
+            
+        except Exception as e:
+            logger.error(f"Transfer failed for {item.file_info.name}: {e}")
+            
+            # Record failure
+            session.rows.append(self._record_transfer(
+                item,
+                item.file_info.path,
+                item.target_path or "",
+                storage_type,
+                TransferStatus.FAILED,
+                str(e)
+            ))
+            return str(e)
+    
     async def transfer_tv_series(
         self,
         items: List[RecognitionResult],
@@ -263,58 +459,97 @@ class TransferService:
         adapter = get_vfs_adapter(storage_type)
         
         # Group items by season
-        seasons: Dict[int, List[RecognitionResult]] = {}
+        seasons: Dict[int, List[RecognitionResult]] = defaultdict(list)
         for item in items:
-            season = item.media_info.season if item.media_info else 1
-            if season not in seasons:
-                seasons[season] = []
-            seasons[season].append(item)
+            seasons[item.media_info.season if item.media_info else 1].append(item)
         
         success_count = 0
         failed_count = 0
         errors = []
         
-        # Process each season
-        for season_num, season_items in seasons.items():
+        sem = asyncio.Semaphore(settings.storage.transfer_concurrency)
+        session = TransferSession()
+        
+        async def move_episode(item: RecognitionResult, season_path: str):
+            nonlocal success_count, failed_count
+            async with sem:
+                try:
+                    ep_names = self.naming_service.generate_names(item)
+                    target_file_path = f"{season_path}/{ep_names['file_name']}"
+                    
+                    await adapter.move(item.file_info.path, target_file_path, overwrite=True)
+                    
+                    session.rows.append(self._record_transfer(
+                        item, item.file_info.path, target_file_path,
+                        storage_type, TransferStatus.COMPLETED
+                    ))
+                    success_count += 1
+                    
+                except Exception as e:
+                    logger.error(f"Failed to transfer episode: {e}")
+                    failed_count += 1
+                    errors.append({"file": item.file_info.name, "error": str(e)})
+        
+        def fail_season(season_num: int, e: Exception):
+            nonlocal failed_count
+            logger.error(f"Failed to process season {season_num}: {e}")
+            failed_count += len(seasons[season_num])
+            for item in seasons[season_num]:
+                errors.append({"file": item.file_info.name, "error": str(e)})
+        
+        try:
+            # Resolve every season folder first
+            season_paths: Dict[int, str] = {}
+            for season_num, season_items in seasons.items():
+                try:
+                    names = self.naming_service.generate_names(season_items[0])
+                    season_folder = names.get("season_folder", f"Season {season_num:02d}")
+                    season_paths[season_num] = _join_path(
+                        target_base_path, names["folder_name"], season_folder
+                    )
+                except Exception as e:
+                    fail_season(season_num, e)
+            
+            # Check which season folders exist in one batch
             try:
-                # Generate season folder name
-                names = self.naming_service.generate_names(season_items[0])
-                season_folder = names.get("season_folder", f"Season {season_num:02d}")
-                season_path = str(PurePosixPath(target_base_path) / names["folder_name"] / season_folder)
-                
-                # Check if season folder exists
-                if await adapter.exists(season_path):
-                    # Remove existing season folder (overwrite behavior)
-                    logger.info(f"Removing existing season folder: {season_path}")
-                    await adapter.delete(season_path, recursive=True)
-                
-                # Create season folder
-                await adapter.mkdir(season_path, parents=True)
-                
-                # Transfer each episode
-                for item in season_items:
-                    try:
-                        ep_names = self.naming_service.generate_names(item)
-                        target_file_path = str(PurePosixPath(season_path) / ep_names["file_name"])
-                        
-                        await adapter.move(item.file_info.path, target_file_path, overwrite=True)
-                        
-                        await self._record_transfer(
-                            db, item, item.file_info.path, target_file_path,
-                            storage_type, TransferStatus.COMPLETED
-                        )
-                        success_count += 1
-                        
-                    except Exception as e:
-                        logger.error(f"Failed to transfer episode: {e}")
-                        failed_count += 1
-                        errors.append({"file": item.file_info.name, "error": str(e)})
-                
+                found = await adapter.exists_batch(list(season_paths.values()))
             except Exception as e:
-                logger.error(f"Failed to process season {season_num}: {e}")
-                failed_count += len(season_items)
-                for item in season_items:
-                    errors.append({"file": item.file_info.name, "error": str(e)})
+                for season_num in season_paths:
+                    fail_season(season_num, e)
+                season_paths = {}
+                found = []
+            stale = {n for n, exists in zip(season_paths, found) if exists}
+            
+            # Seasons use separate folders, so prepare them concurrently
+            prep_sem = asyncio.Semaphore(SEASON_PREP_CONCURRENCY.get(storage_type, 4))
+            
+            async def prepare(season_num: int):
+                async with prep_sem:
+                    await self._prepare_season(
+                        adapter, season_paths[season_num], season_num in stale
+                    )
+            
+            season_nums = list(season_paths)
+            prepared = await asyncio.gather(
+                *map(prepare, season_nums), return_exceptions=True
+            )
+            for season_num, outcome in zip(season_nums, prepared):
+                if isinstance(outcome, Exception):
+                    fail_season(season_num, outcome)
+                    del season_paths[season_num]
+            
+            # Process each season
+            for season_num, season_path in season_paths.items():
+                try:
+                    # Episodes are independent, so move them concurrently
+                    await asyncio.gather(*(
+                        move_episode(item, season_path) for item in seasons[season_num]
+                    ))
+                
+                except Exception as e:
+                    fail_season(season_num, e)
+        finally:
+            await self._save_history(db, session.rows)
         
         return {
             "success": failed_count == 0,
@@ -323,6 +558,21 @@ class TransferService:
             "errors": errors
         }
     
+    async def _prepare_season(
+        self,
+        adapter: VFSAdapter,
+        season_path: str,
+        exists: bool
+    ) -> None:
+        """Replace an existing season folder with an empty one"""
+        if exists:
+            # Remove existing season folder (overwrite behavior)
+            logger.info(f"Removing existing season folder: {season_path}")
+            await adapter.delete(season_path, recursive=True)
+        
+        # Create season folder
+        await adapter.mkdir(season_path, parents=True)
+    
     def _substitute_path_template(
         self,
         template: str,
@@ -334,20 +584,14 @@ class TransferService:
         
         media_info = result.media_info
         
-        # Build substitution map
-        subs = {
-            "{title}": media_info.title or "Unknown",
-            "{year}": str(media_info.year or "Unknown"),
-            "{tmdb_id}": str(media_info.tmdb_id or "0"),
-            "{quality}": media_info.quality or "",
-            "{season}": f"{media_info.season:02d}" if media_info.season else "",
-        }
-        
-        path = template
-        for key, value in subs.items():
-            path = path.replace(key, value)
-        
-        return path
+        return _render_path_template(
+            template,
+            media_info.title or "Unknown",
+            str(media_info.year or "Unknown"),
+            str(media_info.tmdb_id or "0"),
+            media_info.quality or "",
+            f"{media_info.season:02d}" if media_info.season else "",
+        )
     
     def _build_full_target_path(
         self,
@@ -356,7 +600,7 @@ class TransferService:
         media_type: MediaType
     ) -> str:
         """Build full target path including folder and file name"""
-        parts = [base_path]
+        parts = []
         
         if names.get("folder_name"):
             parts.append(names["folder_name"])
@@ -366,34 +610,47 @@ class TransferService:
         
         parts.append(names.get("file_name", "unknown"))
         
-        return str(PurePosixPath(*parts))
+        # Cleaned names can't contain "/", so a plain join is enough
+        return _join_path(base_path, *parts)
     
-    async def _record_transfer(
+    def _record_transfer(
         self,
-        db: AsyncSession,
         item: RecognitionResult,
         source_path: str,
         target_path: str,
         storage_type: StorageType,
         status: TransferStatus,
         error_message: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Build a transfer history row mapping (saved later by _save_history)"""
+        media_info = item.media_info
+        return {
+            "source_path": source_path,
+            "target_path": target_path,
+            "storage_type": storage_type.value,
+            "media_type": media_info.media_type.value if media_info else "unknown",
+            "media_title": media_info.title if media_info else None,
+            "tmdb_id": str(media_info.tmdb_id) if media_info and media_info.tmdb_id else None,
+            "matched_rule_id": item.matched_rule_id,
+            "status": status.value,
+            "error_message": error_message,
+            "user_override": item.user_override,
+            "file_size": item.file_info.size,
+            "completed_at": datetime.utcnow() if status == TransferStatus.COMPLETED else None,
+        }
+    
+    async def _save_history(
+        self,
+        db: AsyncSession,
+        rows: List[Dict[str, Any]]
     ) -> None:
-        """Record transfer in history"""
-        history = TransferHistoryDB(
-            source_path=source_path,
-            target_path=target_path,
-            storage_type=storage_type.value,
-            media_type=item.media_info.media_type.value if item.media_info else "unknown",
-            media_title=item.media_info.title if item.media_info else None,
-            tmdb_id=str(item.media_info.tmdb_id) if item.media_info and item.media_info.tmdb_id else None,
-            matched_rule_id=item.matched_rule_id,
-            status=status.value,
-            error_message=error_message,
-            user_override=item.user_override,
-            file_size=item.file_info.size,
-            completed_at=datetime.utcnow() if status == TransferStatus.COMPLETED else None
-        )
+        """Bulk insert history rows in chunks (Core executemany) and commit once"""
+        if not rows:
+            return
         
-        db.add(history)
+        # Table-level insert: write-only logging needs no ORM bookkeeping
+        stmt = TransferHistoryDB.__table__.insert()
+        for i in range(0, len(rows), HISTORY_FLUSH_SIZE):
+            await db.execute(stmt, rows[i:i + HISTORY_FLUSH_SIZE])
         await db.commit()
 
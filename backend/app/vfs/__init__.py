@@ -7,7 +7,7 @@ from .base import VFSAdapter, VFSError, VFSNotFoundError, VFSPermissionError
 from .local_adapter import LocalAdapter
 from .p115_adapter import P115Adapter
 from .webdav_adapter import WebDAVAdapter
-from .factory import get_vfs_adapter, register_adapter
+from .factory import get_vfs_adapter, register_adapter, close_adapters
 
 __all__ = [
     "VFSAdapter",
@@ -19,5 +19,6 @@ __all__ = [
     "WebDAVAdapter",
     "get_vfs_adapter",
     "register_adapter",
+    "close_adapters",
 ]
 
@@ -2,15 +2,23 @@
 Base VFS adapter interface
 """
 
+import asyncio
 from abc import ABC, abstractmethod
+from collections import defaultdict
 from dataclasses import dataclass
 from datetime import datetime
-from typing import AsyncIterator, List, Optional, Union
-from pathlib import PurePath
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, TypeVar, Union
+from pathlib import PurePath, PurePosixPath
 
 from ..models.schemas import StorageType, FileInfo
 
 
+# Max concurrent directory listings during walk()
+WALK_CONCURRENCY = 8
+
+T = TypeVar("T")
+
+
 class VFSError(Exception):
     """Base VFS exception"""
     pass
@@ -80,6 +88,45 @@ class VFSAdapter(ABC):
         """
         pass
     
+    async def exists_batch(self, paths: List[str]) -> List[bool]:
+        """
+        Check several paths at once.
+        
+        Adapters with costly per-path lookups override this to share
+        round trips between paths.
+        
+        Args:
+            paths: File/directory paths
+            
+        Returns:
+            Existence flag for each path, in order
+        """
+        return list(await asyncio.gather(*map(self.exists, paths)))
+    
+    async def _exists_batch_by_parent(self, paths: List[str]) -> List[bool]:
+        """Answer exists_batch with one list_dir per distinct parent directory"""
+        by_parent: Dict[str, List[int]] = defaultdict(list)
+        found = [False] * len(paths)
+        for i, path in enumerate(paths):
+            if path.rstrip("/") == "":
+                found[i] = True  # Root always exists
+            else:
+                by_parent[str(PurePosixPath(path).parent)].append(i)
+        
+        async def names_in(parent: str) -> set:
+            try:
+                return {item.name for item in await self.list_dir(parent)}
+            except VFSNotFoundError:
+                return set()
+        
+        parents = list(by_parent)
+        listings = await asyncio.gather(*map(names_in, parents))
+        for parent, names in zip(parents, listings):
+            for i in by_parent[parent]:
+                found[i] = PurePosixPath(paths[i]).name in names
+        
+        return found
+    
     @abstractmethod
     async def is_dir(self, path: str) -> bool:
         """
@@ -112,6 +159,10 @@ class VFSAdapter(ABC):
         """
         Move file or directory.
         
+        Implementations must use a rename when src and dst are on the same
+        filesystem (single atomic operation), falling back to copy+delete
+        only across filesystems.
+        
         Args:
             src: Source path
             dst: Destination path
@@ -178,7 +229,8 @@ class VFSAdapter(ABC):
     ) -> AsyncIterator[FileInfo]:
         """
         Walk directory tree recursively.
-        Convenience method wrapping iter_dir.
+        Breadth-first: all directories of one level are listed concurrently
+        (at most WALK_CONCURRENCY at a time).
         
         Args:
             path: Root directory path
@@ -187,8 +239,31 @@ class VFSAdapter(ABC):
         Yields:
             FileInfo objects
         """
-        async for item in self.iter_dir(path, recursive=True, files_only=files_only):
-            yield item
+        sem = asyncio.Semaphore(WALK_CONCURRENCY)
+        
+        async def list_bounded(dir_path: str) -> List[FileInfo]:
+            async with sem:
+                return await self.list_dir(dir_path)
+        
+        level = [path]
+        while level:
+            listings = await asyncio.gather(*map(list_bounded, level))
+            level = []
+            for entries in listings:
+                for entry in entries:
+                    if entry.is_dir:
+                        level.append(entry.path)
+                        if files_only:
+                            continue
+                    yield entry
+    
+    async def _threaded(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run a blocking call in a worker thread"""
+        return await asyncio.to_thread(fn, *args)
+    
+    async def close(self) -> None:
+        """Release network clients or other resources held by the adapter"""
+        pass
     
     def normalize_path(self, path: str) -> str:
         """
@@ -2,7 +2,8 @@
 VFS adapter factory
 """
 
-from typing import Dict, Optional, Type
+import logging
+from typing import Any, Dict, Tuple, Type
 
 from .base import VFSAdapter, VFSError
 from .local_adapter import LocalAdapter
@@ -10,6 +11,8 @@ from .p115_adapter import P115Adapter
 from .webdav_adapter import WebDAVAdapter
 from ..models.schemas import StorageType
 
+logger = logging.getLogger(__name__)
+
 
 # Registry of VFS adapters
 _adapters: Dict[StorageType, Type[VFSAdapter]] = {
@@ -18,8 +21,19 @@ _adapters: Dict[StorageType, Type[VFSAdapter]] = {
     StorageType.WEBDAV: WebDAVAdapter,
 }
 
-# Cached adapter instances
-_instances: Dict[str, VFSAdapter] = {}
+# Cached adapter instances, keyed by (storage_type, canonical kwargs)
+_instances: Dict[Tuple, VFSAdapter] = {}
+
+
+def _canonicalize(value: Any) -> Any:
+    """Turn a kwargs value into a hashable, order-independent form"""
+    if isinstance(value, dict):
+        return frozenset((k, _canonicalize(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(_canonicalize(v) for v in value)
+    if isinstance(value, set):
+        return frozenset(_canonicalize(v) for v in value)
+    return value
 
 
 def register_adapter(storage_type: StorageType, adapter_class: Type[VFSAdapter]) -> None:
@@ -54,7 +68,10 @@ def get_vfs_adapter(
         raise VFSError(f"No adapter registered for storage type: {storage_type}")
     
     # Create cache key
-    cache_key = f"{storage_type.value}:{hash(frozenset(kwargs.items()))}"
+    cache_key = (
+        storage_type,
+        tuple(sorted((k, _canonicalize(v)) for k, v in kwargs.items())),
+    )
     
     # Return cached instance if available
     if cache_key in _instances:
@@ -74,3 +91,15 @@ def clear_adapter_cache() -> None:
     """Clear all cached adapter instances"""
     _instances.clear()
 
+
+async def close_adapters() -> None:
+    """Close all cached adapter instances (application shutdown)"""
+    instances = list(_instances.values())
+    _instances.clear()
+    
+    for instance in instances:
+        try:
+            await instance.close()
+        except Exception as e:
+            logger.warning(f"Error closing {type(instance).__name__}: {e}")
+
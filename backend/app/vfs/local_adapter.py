@@ -3,16 +3,128 @@ Local filesystem VFS adapter
 """
 
 import os
+import errno
 import shutil
+import stat
 import asyncio
 from datetime import datetime
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from typing import AsyncIterator, List
+from typing import AsyncIterator, Iterator, List
 
 from .base import VFSAdapter, VFSError, VFSNotFoundError, VFSPermissionError
 from ..models.schemas import StorageType, FileInfo
 
 
+# Bytes per kernel-side copy call, and buffer size for the userspace fallback
+COPY_CHUNK_SIZE = 1 << 30
+COPY_BUFFER_SIZE = 1 << 20
+
+# Entries handed from the scanning thread to the event loop per hop
+SCAN_CHUNK_SIZE = 256
+
+# Removals per worker-thread hop when deleting a directory tree
+RMTREE_BATCH_SIZE = 1024
+
+# Errors meaning a kernel copy primitive isn't usable for this file pair
+_NO_KERNEL_COPY = frozenset({errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP})
+
+
+def _fast_copyfile(src: str, dst: str) -> None:
+    """
+    Copy a file's contents and metadata, keeping the data in the kernel.
+    
+    Tries copy_file_range (which can clone on CoW/NFS), then sendfile,
+    then a buffered read/write loop; each step resumes where the last
+    one stopped. A primitive that copies nothing on its first call is
+    treated as unsupported, and the result is checked against the
+    source size.
+    """
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        infd, outfd = fsrc.fileno(), fdst.fileno()
+        size = os.fstat(infd).st_size
+        sent = 0
+        done = False
+        
+        if hasattr(os, "copy_file_range"):
+            try:
+                while n := os.copy_file_range(
+                    infd, outfd, COPY_CHUNK_SIZE, offset_src=sent, offset_dst=sent
+                ):
+                    sent += n
+                done = sent > 0
+            except OSError as e:
+                if e.errno not in _NO_KERNEL_COPY:
+                    raise
+        
+        if not done:
+            try:
+                os.lseek(outfd, sent, os.SEEK_SET)
+                while n := os.sendfile(outfd, infd, sent, COPY_CHUNK_SIZE):
+                    sent += n
+                done = sent > 0
+            except OSError as e:
+                if e.errno not in _NO_KERNEL_COPY:
+                    raise
+        
+        if not done:
+            fsrc.seek(sent)
+            fdst.seek(sent)
+            buf = bytearray(COPY_BUFFER_SIZE)
+            view = memoryview(buf)
+            while n := fsrc.readinto(buf):
+                fdst.write(view[:n])
+                sent += n
+        
+        if sent != size:
+            raise OSError(errno.EIO, f"Short copy ({sent} of {size} bytes)", src)
+    
+    shutil.copystat(src, dst)
+
+
+def _iter_rmtree(root: str) -> Iterator[bool]:
+    """
+    Remove a directory tree bottom-up, pausing every RMTREE_BATCH_SIZE
+    removals so the work can be spread over several thread hops.
+    
+    Symlinks are unlinked, never followed.
+    """
+    removed = 0
+    stack = [(root, False)]
+    while stack:
+        path, emptied = stack.pop()
+        if emptied:
+            os.rmdir(path)
+            removed += 1
+            continue
+        
+        stack.append((path, True))
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append((entry.path, False))
+                    continue
+                os.unlink(entry.path)
+                removed += 1
+                if removed >= RMTREE_BATCH_SIZE:
+                    removed = 0
+                    yield True
+
+
+async def _rmtree(root: str) -> None:
+    """Remove a directory tree in batches, freeing the worker thread in between"""
+    steps = _iter_rmtree(root)
+    while await asyncio.to_thread(next, steps, False):
+        pass
+
+
+@lru_cache(maxsize=65536)
+def _mtime_to_datetime(timestamp: int) -> datetime:
+    """Convert a whole-second mtime (files in a tree tend to share them)"""
+    return datetime.fromtimestamp(timestamp)
+
+
 class LocalAdapter(VFSAdapter):
     """VFS adapter for local filesystem"""
     
@@ -26,42 +138,92 @@ class LocalAdapter(VFSAdapter):
             base_path: Optional base path to prepend to all paths
         """
         self.base_path = Path(base_path) if base_path else None
+        self._base_str = str(self.base_path) if self.base_path else ""
     
-    def _resolve_path(self, path: str) -> Path:
+    def _resolve_path(self, path: str) -> str:
         """Resolve path relative to base_path"""
-        p = Path(path)
-        if self.base_path and not p.is_absolute():
-            p = self.base_path / p
-        return p.resolve()
-    
-    def _file_info_from_path(self, path: Path) -> FileInfo:
-        """Create FileInfo from Path object"""
-        stat = path.stat()
-        return FileInfo(
-            name=path.name,
-            path=str(path),
-            size=stat.st_size if path.is_file() else 0,
-            is_dir=path.is_dir(),
-            extension=path.suffix if path.is_file() else None,
-            modified_time=datetime.fromtimestamp(stat.st_mtime),
+        if self._base_str and not os.path.isabs(path):
+            path = os.path.join(self._base_str, path)
+        return os.path.realpath(path)
+    
+    def _file_info_from_path(self, path: str) -> FileInfo:
+        """Create FileInfo from a path (a single stat call, no validation)"""
+        st = os.stat(path)
+        is_file = stat.S_ISREG(st.st_mode)
+        name = os.path.basename(path)
+        return FileInfo.model_construct(
+            name=name,
+            path=path,
+            size=st.st_size if is_file else 0,
+            is_dir=stat.S_ISDIR(st.st_mode),
+            extension=os.path.splitext(name)[1] if is_file else None,
+            modified_time=_mtime_to_datetime(int(st.st_mtime)),
+            storage_type=StorageType.LOCAL
+        )
+    
+    def _file_info_from_dirent(self, entry: os.DirEntry) -> FileInfo:
+        """Create FileInfo from a scandir entry (type and stat are cached on it)"""
+        st = entry.stat()
+        is_file = stat.S_ISREG(st.st_mode)
+        return FileInfo.model_construct(
+            name=entry.name,
+            path=entry.path,
+            size=st.st_size if is_file else 0,
+            is_dir=stat.S_ISDIR(st.st_mode),
+            extension=os.path.splitext(entry.name)[1] if is_file else None,
+            modified_time=_mtime_to_datetime(int(st.st_mtime)),
             storage_type=StorageType.LOCAL
         )
     
+    def _scan_dir(self, root: str, files_only: bool = False) -> List[FileInfo]:
+        """List one directory with scandir (blocking; skips vanished entries)"""
+        items = []
+        with os.scandir(root) as it:
+            for entry in it:
+                try:
+                    if files_only and entry.is_dir():
+                        continue
+                    items.append(self._file_info_from_dirent(entry))
+                except (FileNotFoundError, PermissionError):
+                    continue
+        return items
+    
+    def _scan_tree(self, root: str, files_only: bool) -> Iterator[FileInfo]:
+        """
+        Depth-first scandir walk (blocking; skips unreadable directories).
+        
+        Symlinked directories are reported as directories but not descended.
+        """
+        stack = [root]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as it:
+                    for entry in it:
+                        try:
+                            if entry.is_dir():
+                                if entry.is_dir(follow_symlinks=False):
+                                    stack.append(entry.path)
+                                if files_only:
+                                    continue
+                            yield self._file_info_from_dirent(entry)
+                        except (FileNotFoundError, PermissionError):
+                            continue
+            except (FileNotFoundError, PermissionError, NotADirectoryError):
+                continue
+    
     async def list_dir(self, path: str) -> List[FileInfo]:
         """List directory contents"""
         resolved = self._resolve_path(path)
         
-        if not resolved.exists():
+        if not os.path.exists(resolved):
             raise VFSNotFoundError(f"Path not found: {path}")
         
-        if not resolved.is_dir():
+        if not os.path.isdir(resolved):
             raise VFSError(f"Not a directory: {path}")
         
         try:
-            # Run in executor to avoid blocking
-            loop = asyncio.get_event_loop()
-            items = await loop.run_in_executor(None, list, resolved.iterdir())
-            return [self._file_info_from_path(item) for item in items]
+            # Run in a worker thread to avoid blocking
+            return await asyncio.to_thread(self._scan_dir, resolved)
         except PermissionError as e:
             raise VFSPermissionError(f"Permission denied: {path}") from e
     
@@ -69,58 +231,67 @@ class LocalAdapter(VFSAdapter):
         """Get file/directory information"""
         resolved = self._resolve_path(path)
         
-        if not resolved.exists():
-            raise VFSNotFoundError(f"Path not found: {path}")
-        
-        return self._file_info_from_path(resolved)
+        try:
+            return self._file_info_from_path(resolved)
+        except FileNotFoundError as e:
+            raise VFSNotFoundError(f"Path not found: {path}") from e
     
     async def exists(self, path: str) -> bool:
         """Check if path exists"""
-        return self._resolve_path(path).exists()
+        return os.path.exists(self._resolve_path(path))
     
     async def is_dir(self, path: str) -> bool:
         """Check if path is a directory"""
-        resolved = self._resolve_path(path)
-        return resolved.exists() and resolved.is_dir()
+        return os.path.isdir(self._resolve_path(path))
     
     async def mkdir(self, path: str, parents: bool = True) -> bool:
         """Create directory"""
         resolved = self._resolve_path(path)
         
         try:
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(
-                None,
-                lambda: resolved.mkdir(parents=parents, exist_ok=True)
-            )
+            if parents:
+                await asyncio.to_thread(os.makedirs, resolved, exist_ok=True)
+            elif not os.path.isdir(resolved):
+                await asyncio.to_thread(os.mkdir, resolved)
             return True
         except Exception as e:
             raise VFSError(f"Failed to create directory: {path}") from e
     
     async def move(self, src: str, dst: str, overwrite: bool = True) -> bool:
-        """Move file or directory"""
+        """Move file or directory (one worker-thread hop for the whole move)"""
+        return await self._threaded(self._move_sync, src, dst, overwrite)
+    
+    def _move_sync(self, src: str, dst: str, overwrite: bool) -> bool:
+        """Blocking body of move()"""
         src_path = self._resolve_path(src)
         dst_path = self._resolve_path(dst)
         
-        if not src_path.exists():
+        if not os.path.exists(src_path):
             raise VFSNotFoundError(f"Source not found: {src}")
         
-        if dst_path.exists():
+        if os.path.exists(dst_path):
             if not overwrite:
                 raise VFSError(f"Destination already exists: {dst}")
-            # Remove destination
-            loop = asyncio.get_event_loop()
-            if dst_path.is_dir():
-                await loop.run_in_executor(None, shutil.rmtree, dst_path)
-            else:
-                await loop.run_in_executor(None, dst_path.unlink)
+            # Remove destination; a file replaced by a file is left for
+            # the rename to overwrite atomically
+            if os.path.isdir(dst_path):
+                shutil.rmtree(dst_path)
+            elif os.path.isdir(src_path):
+                os.unlink(dst_path)
         
         # Ensure parent directory exists
-        dst_path.parent.mkdir(parents=True, exist_ok=True)
+        os.makedirs(os.path.dirname(dst_path), exist_ok=True)
         
         try:
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(None, shutil.move, str(src_path), str(dst_path))
+            try:
+                # Same filesystem: a single rename
+                os.replace(src_path, dst_path)
+            except OSError as e:
+                if e.errno != errno.EXDEV:
+                    raise
+                # Across filesystems: kernel-side copy (a clone where the
+                # filesystem supports it), then delete the source
+                shutil.move(src_path, dst_path, copy_function=_fast_copyfile)
             return True
         except Exception as e:
             raise VFSError(f"Failed to move: {src} -> {dst}") from e
@@ -130,28 +301,26 @@ class LocalAdapter(VFSAdapter):
         src_path = self._resolve_path(src)
         dst_path = self._resolve_path(dst)
         
-        if not src_path.exists():
+        if not os.path.exists(src_path):
             raise VFSNotFoundError(f"Source not found: {src}")
         
-        if dst_path.exists():
+        if os.path.exists(dst_path):
             if not overwrite:
                 raise VFSError(f"Destination already exists: {dst}")
             # Remove destination
-            loop = asyncio.get_event_loop()
-            if dst_path.is_dir():
-                await loop.run_in_executor(None, shutil.rmtree, dst_path)
+            if os.path.isdir(dst_path):
+                await _rmtree(dst_path)
             else:
-                await loop.run_in_executor(None, dst_path.unlink)
+                await asyncio.to_thread(os.unlink, dst_path)
         
         # Ensure parent directory exists
-        dst_path.parent.mkdir(parents=True, exist_ok=True)
+        os.makedirs(os.path.dirname(dst_path), exist_ok=True)
         
         try:
-            loop = asyncio.get_event_loop()
-            if src_path.is_dir():
-                await loop.run_in_executor(None, shutil.copytree, str(src_path), str(dst_path))
+            if os.path.isdir(src_path):
+                await asyncio.to_thread(shutil.copytree, src_path, dst_path)
             else:
-                await loop.run_in_executor(None, shutil.copy2, str(src_path), str(dst_path))
+                await asyncio.to_thread(_fast_copyfile, src_path, dst_path)
             return True
         except Exception as e:
             raise VFSError(f"Failed to copy: {src} -> {dst}") from e
@@ -160,18 +329,17 @@ class LocalAdapter(VFSAdapter):
         """Delete file or directory"""
         resolved = self._resolve_path(path)
         
-        if not resolved.exists():
+        if not os.path.exists(resolved):
             return True  # Already doesn't exist
         
         try:
-            loop = asyncio.get_event_loop()
-            if resolved.is_dir():
+            if os.path.isdir(resolved):
                 if recursive:
-                    await loop.run_in_executor(None, shutil.rmtree, resolved)
+                    await _rmtree(resolved)
                 else:
-                    await loop.run_in_executor(None, resolved.rmdir)
+                    await asyncio.to_thread(os.rmdir, resolved)
             else:
-                await loop.run_in_executor(None, resolved.unlink)
+                await asyncio.to_thread(os.unlink, resolved)
             return True
         except Exception as e:
             raise VFSError(f"Failed to delete: {path}") from e
@@ -185,36 +353,30 @@ class LocalAdapter(VFSAdapter):
         """Iterate directory contents"""
         resolved = self._resolve_path(path)
         
-        if not resolved.exists():
+        if not os.path.exists(resolved):
             raise VFSNotFoundError(f"Path not found: {path}")
         
-        if not resolved.is_dir():
+        if not os.path.isdir(resolved):
             raise VFSError(f"Not a directory: {path}")
         
         if recursive:
-            # Use os.walk for recursive iteration
-            loop = asyncio.get_event_loop()
-            
-            def _walk():
-                for root, dirs, files in os.walk(resolved):
-                    root_path = Path(root)
-                    if not files_only:
-                        for d in dirs:
-                            yield root_path / d
-                    for f in files:
-                        yield root_path / f
-            
-            for item_path in await loop.run_in_executor(None, lambda: list(_walk())):
-                try:
-                    yield self._file_info_from_path(item_path)
-                except (FileNotFoundError, PermissionError):
-                    continue
+            # Scan in a worker thread, handing entries over in chunks so
+            # the first ones arrive without waiting for the whole tree
+            scan = self._scan_tree(resolved, files_only)
+            while chunk := await asyncio.to_thread(
+                lambda: list(islice(scan, SCAN_CHUNK_SIZE))
+            ):
+                for info in chunk:
+                    yield info
         else:
-            for item in resolved.iterdir():
-                if files_only and item.is_dir():
-                    continue
-                try:
-                    yield self._file_info_from_path(item)
-                except (FileNotFoundError, PermissionError):
-                    continue
-
+            for info in await asyncio.to_thread(self._scan_dir, resolved, files_only):
+                yield info
+    
+    async def walk(
+        self,
+        path: str,
+        files_only: bool = True
+    ) -> AsyncIterator[FileInfo]:
+        """Walk directory tree recursively (scandir in a worker thread)"""
+        async for item in self.iter_dir(path, recursive=True, files_only=files_only):
+            yield item
@@ -5,9 +5,11 @@ Uses p115client for API interactions.
 
 import asyncio
 import logging
+import time
+from collections import defaultdict
 from datetime import datetime
-from typing import AsyncIterator, List, Optional, Dict, Any
-from pathlib import PurePosixPath
+from functools import lru_cache
+from typing import AsyncIterator, List, Optional, Dict, Any, Tuple
 
 from .base import VFSAdapter, VFSError, VFSNotFoundError, VFSPermissionError
 from ..models.schemas import StorageType, FileInfo
@@ -16,6 +18,59 @@ from ..core.config import settings
 logger = logging.getLogger(__name__)
 
 
+# Items per fs_files page
+PAGE_SIZE = 1000
+
+# Max fs_files page requests in flight per adapter
+PAGE_CONCURRENCY = 8
+
+# Fetched pages buffered ahead of a listing's consumer
+PAGE_PREFETCH = 2
+
+# Seconds to remember that a path doesn't exist (capped by the metadata TTL)
+NEGATIVE_CACHE_TTL = 5.0
+
+# Directories listed concurrently by a recursive iter_dir
+WALK_WORKERS = 8
+
+# Parsed entries buffered ahead of a recursive iter_dir consumer
+WALK_QUEUE_SIZE = 1024
+
+# P115Client instances shared by all adapters, keyed by cookies
+_clients: Dict[str, Any] = {}
+_clients_lock = asyncio.Lock()
+
+
+def _field(item: Dict[str, Any], key: str, alt: str, default: Any = None) -> Any:
+    """Get a field that the 115 API returns under either of two names"""
+    value = item.get(key)
+    return item.get(alt, default) if value is None else value
+
+
+@lru_cache(maxsize=4096)
+def _split_path(path: str) -> Tuple[str, ...]:
+    """Split a path into its non-empty components"""
+    return tuple(part for part in path.split("/") if part)
+
+
+@lru_cache(maxsize=4096)
+def _parent_and_name(path: str) -> Tuple[str, str]:
+    """Split a path into its normalized parent and final component"""
+    parts = _split_path(path.strip())
+    if not parts:
+        return "/", ""
+    return "/" + "/".join(parts[:-1]), parts[-1]
+
+
+@lru_cache(maxsize=1024)
+def _parse_mtime(value: str) -> Optional[datetime]:
+    """Parse a 115 minute-resolution timestamp (shared by many entries)"""
+    try:
+        return datetime.strptime(value, "%Y-%m-%d %H:%M")
+    except (ValueError, TypeError):
+        return None
+
+
 class P115Adapter(VFSAdapter):
     """VFS adapter for 115 cloud storage"""
     
@@ -32,6 +87,58 @@ class P115Adapter(VFSAdapter):
         self._client = None
         self._fs = None
         self._initialized = False
+        # path -> (value, expires_at); writes through this adapter
+        # invalidate the affected entries
+        self._cid_cache: Dict[str, Tuple[str, float]] = {}
+        self._list_cache: Dict[str, Tuple[List[FileInfo], float]] = {}
+        self._missing_cache: Dict[str, Tuple[bool, float]] = {}
+        self._page_sem = asyncio.Semaphore(PAGE_CONCURRENCY)
+    
+    def _normalize(self, path: str) -> str:
+        """Normalize a path to "/a/b" form"""
+        return "/" + "/".join(_split_path(path.strip()))
+    
+    def _cache_get(self, cache: Dict[str, Tuple[Any, float]], path: str) -> Any:
+        """Get an unexpired cache entry, or None"""
+        entry = cache.get(path)
+        if entry is None:
+            return None
+        if entry[1] < time.monotonic():
+            del cache[path]
+            return None
+        return entry[0]
+    
+    def _cache_put(
+        self,
+        cache: Dict[str, Tuple[Any, float]],
+        path: str,
+        value: Any,
+        ttl: Optional[float] = None
+    ):
+        """Store a cache entry for ttl seconds (capped by the configured TTL)"""
+        ttl = min(ttl or float("inf"), settings.p115.metadata_cache_ttl)
+        if ttl > 0:
+            cache[path] = (value, time.monotonic() + ttl)
+    
+    def _invalidate(self, *paths: str):
+        """Drop cached entries for paths, their subtrees and their parents' listings"""
+        for path in paths:
+            path = self._normalize(path)
+            prefix = path.rstrip("/") + "/"
+            for cache in (self._cid_cache, self._list_cache):
+                for key in [k for k in cache if k == path or k.startswith(prefix)]:
+                    del cache[key]
+            self._list_cache.pop(_parent_and_name(path)[0], None)
+            self._forget_missing(path)
+    
+    def _forget_missing(self, path: str):
+        """Drop negative entries for a path that may now exist, its subtree and ancestors"""
+        if not self._missing_cache:
+            return
+        prefix = path.rstrip("/") + "/"
+        for key in list(self._missing_cache):
+            if key == path or key.startswith(prefix) or path.startswith(key + "/"):
+                del self._missing_cache[key]
     
     async def _ensure_initialized(self):
         """Ensure client is initialized"""
@@ -41,59 +148,65 @@ class P115Adapter(VFSAdapter):
         if not self._cookies:
             raise VFSError("115 cookies not configured")
         
-        try:
-            # Import p115client
-            from p115client import P115Client
-            
-            # Initialize client with cookies
-            self._client = P115Client(self._cookies)
-            self._initialized = True
-            logger.info("P115 client initialized successfully")
-        except ImportError:
-            raise VFSError("p115client package not installed")
-        except Exception as e:
-            raise VFSError(f"Failed to initialize 115 client: {e}")
+        async with _clients_lock:
+            client = _clients.get(self._cookies)
+            if client is None:
+                try:
+                    # Import p115client
+                    from p115client import P115Client
+                    
+                    # Initialize client with cookies
+                    client = await asyncio.to_thread(P115Client, self._cookies)
+                    logger.info("P115 client initialized successfully")
+                except ImportError:
+                    raise VFSError("p115client package not installed")
+                except Exception as e:
+                    raise VFSError(f"Failed to initialize 115 client: {e}")
+                _clients[self._cookies] = client
+        
+        self._client = client
+        self._initialized = True
     
     def _parse_file_item(self, item: Dict[str, Any], parent_path: str = "") -> FileInfo:
         """Parse 115 API file item to FileInfo"""
-        name = item.get("name", item.get("n", ""))
-        is_dir = item.get("fc", item.get("fid")) is None  # No file_id means directory
+        name = _field(item, "name", "n", "")
+        is_dir = _field(item, "fc", "fid") is None  # No file_id means directory
         
         # Build full path
-        if parent_path:
-            path = str(PurePosixPath(parent_path) / name)
-        else:
-            path = "/" + name
+        path = f"{parent_path.rstrip('/')}/{name}"
         
         # Get file size
-        size = int(item.get("size", item.get("s", 0)))
+        size = int(_field(item, "size", "s", 0))
         
         # Get modification time
-        mtime = item.get("te", item.get("t", ""))
+        mtime = _field(item, "te", "t", "")
         modified_time = None
         if mtime:
-            try:
-                if isinstance(mtime, (int, float)):
+            if isinstance(mtime, (int, float)):
+                try:
                     modified_time = datetime.fromtimestamp(mtime)
-                else:
-                    modified_time = datetime.strptime(mtime, "%Y-%m-%d %H:%M")
-            except (ValueError, TypeError):
-                pass
+                except (ValueError, OverflowError, OSError):
+                    pass
+            else:
+                modified_time = _parse_mtime(mtime)
         
         # Get extension
         extension = None
-        if not is_dir and "." in name:
-            extension = "." + name.rsplit(".", 1)[-1].lower()
+        if not is_dir:
+            _, dot, ext = name.rpartition(".")
+            if dot:
+                extension = "." + ext.lower()
         
-        return FileInfo(
+        # Fields are already typed here, so skip validation
+        return FileInfo.model_construct(
             name=name,
             path=path,
             size=size,
             is_dir=is_dir,
             extension=extension,
             modified_time=modified_time,
-            pickcode=item.get("pc", item.get("pickcode")),
-            file_id=str(item.get("fid", item.get("cid", ""))),
+            pickcode=_field(item, "pc", "pickcode"),
+            file_id=str(_field(item, "fid", "cid", "")),
             storage_type=StorageType.P115
         )
     
@@ -103,21 +216,27 @@ class P115Adapter(VFSAdapter):
         
         try:
             # Normalize path
-            path = path.strip()
-            if not path.startswith("/"):
-                path = "/" + path
+            path = self._normalize(path)
+            
+            cached = self._cache_get(self._list_cache, path)
+            if cached is not None:
+                return list(cached)
             
             # Get directory ID
             cid = await self._get_dir_id(path)
             if cid is None:
                 raise VFSNotFoundError(f"Path not found: {path}")
             
-            # List files in directory
+            # List files in directory; subdirectory cids come for free
             files = []
             async for item in self._iter_dir_by_cid(cid):
-                files.append(self._parse_file_item(item, path))
+                info = self._parse_file_item(item, path)
+                if info.is_dir and info.file_id:
+                    self._cache_put(self._cid_cache, info.path, info.file_id)
+                files.append(info)
             
-            return files
+            self._cache_put(self._list_cache, path, files)
+            return list(files)
             
         except VFSNotFoundError:
             raise
@@ -127,63 +246,171 @@ class P115Adapter(VFSAdapter):
     
     async def _get_dir_id(self, path: str) -> Optional[str]:
         """Get directory ID (cid) from path"""
-        if path == "/" or path == "":
+        return await self._resolve_dir(path)
+    
+    async def _ensure_dir(self, path: str, parents: bool = True) -> str:
+        """Get a directory's cid, creating it (and missing parents if allowed)"""
+        cid = await self._resolve_dir(path, create=True, parents=parents)
+        if cid is None:
+            raise VFSNotFoundError(f"Parent directory not found: {path}")
+        return cid
+    
+    async def _resolve_dir(
+        self,
+        path: str,
+        create: bool = False,
+        parents: bool = True
+    ) -> Optional[str]:
+        """
+        Walk to a directory's cid, resuming from the deepest cached ancestor.
+        
+        With create, missing components are made on the way (only the last
+        one unless parents); otherwise a missing component gives None.
+        """
+        parts = _split_path(path.strip())
+        if not parts:
             return "0"  # Root directory
         
-        # Navigate path components
-        parts = [p for p in path.split("/") if p]
+        # Resume from the deepest cached ancestor
         current_cid = "0"
+        current_path = ""
+        depth = 0
+        for i in range(len(parts), 0, -1):
+            candidate = "/" + "/".join(parts[:i])
+            cid = self._cache_get(self._cid_cache, candidate)
+            if cid is not None:
+                current_cid, current_path, depth = cid, candidate, i
+                break
         
-        for part in parts:
-            found = False
-            async for item in self._iter_dir_by_cid(current_cid):
-                name = item.get("name", item.get("n", ""))
-                if name == part:
-                    # Check if it's a directory
-                    cid = item.get("cid")
-                    if cid:
-                        current_cid = str(cid)
-                        found = True
-                        break
-            
-            if not found:
-                return None
+        # Navigate remaining path components; below a created directory
+        # nothing exists yet, so there's nothing to look up
+        created = False
+        for i in range(depth, len(parts)):
+            part = parts[i]
+            cid = None
+            if not created:
+                raw = await self._find_child(current_cid, part)
+                # Only directories carry their own cid
+                if raw and raw.get("cid"):
+                    cid = str(raw["cid"])
+            
+            if cid is None:
+                if not create or (not parents and i < len(parts) - 1):
+                    return None
+                cid = await self._create_dir(current_cid, part, f"{current_path}/{part}")
+                created = True
+            
+            current_cid = cid
+            current_path = f"{current_path}/{part}"
+            self._cache_put(self._cid_cache, current_path, current_cid)
         
         return current_cid
     
+    async def _create_dir(self, parent_cid: str, name: str, path: str) -> str:
+        """Create one directory with fs_mkdir and return its cid"""
+        resp = await asyncio.to_thread(
+            self._client.fs_mkdir,
+            {"pid": parent_cid, "cname": name}
+        )
+        self._invalidate(path)
+        
+        cid = None
+        if resp and resp.get("state", False):
+            cid = resp.get("cid") or resp.get("file_id")
+        if not cid:
+            # Not in the response, or created concurrently by another call
+            raw = await self._find_child(parent_cid, name)
+            cid = raw.get("cid") if raw else None
+        if not cid:
+            raise VFSError(f"Failed to create directory: {path}")
+        
+        return str(cid)
+    
     async def _iter_dir_by_cid(self, cid: str) -> AsyncIterator[Dict[str, Any]]:
-        """Iterate directory contents by cid"""
-        try:
-            # Use p115client to list files
-            offset = 0
-            limit = 1000
-            
-            while True:
-                # Call 115 API to list files
+        """
+        Iterate directory contents by cid.
+        
+        A producer task fetches pages up to PAGE_PREFETCH ahead of the
+        consumer, so parsing one page overlaps with requesting the next.
+        """
+        limit = PAGE_SIZE
+        pages: asyncio.Queue = asyncio.Queue(maxsize=PAGE_PREFETCH)
+        done = object()
+        
+        async def fetch(offset: int) -> Optional[Dict[str, Any]]:
+            async with self._page_sem:
                 resp = await asyncio.to_thread(
                     self._client.fs_files,
                     {"cid": cid, "offset": offset, "limit": limit}
                 )
-                
-                if not resp or resp.get("errNo", 0) != 0:
-                    break
-                
-                data = resp.get("data", [])
-                if not data:
-                    break
-                
-                for item in data:
-                    yield item
+            if not resp or resp.get("errNo", 0) != 0:
+                return None
+            return resp
+        
+        async def produce():
+            # The first page tells us the total, so the rest can be
+            # requested concurrently
+            resp = await fetch(0)
+            if resp is None:
+                return
+            
+            data = resp.get("data", [])
+            await pages.put(data)
+            
+            if len(data) < limit:
+                return
+            
+            try:
+                count = int(resp.get("count") or 0)
+            except (TypeError, ValueError):
+                count = 0
+            
+            if count > limit:
+                tasks = [
+                    asyncio.create_task(fetch(offset))
+                    for offset in range(limit, count, limit)
+                ]
+                try:
+                    for task in tasks:
+                        page = await task
+                        await pages.put((page or {}).get("data", []))
+                finally:
+                    for task in tasks:
+                        task.cancel()
+                return
+            
+            # Total unknown: page sequentially
+            offset = limit
+            while (resp := await fetch(offset)) and (data := resp.get("data")):
+                await pages.put(data)
                 
                 # Check if there are more pages
                 if len(data) < limit:
                     break
-                    
+                
                 offset += limit
+        
+        async def pager():
+            try:
+                await produce()
+            except Exception as e:
+                await pages.put(e)
+            else:
+                await pages.put(done)
+        
+        producer = asyncio.create_task(pager())
+        try:
+            while (data := await pages.get()) is not done:
+                if isinstance(data, Exception):
+                    raise data
+                for item in data:
+                    yield item
                 
         except Exception as e:
             logger.error(f"Error iterating directory {cid}: {e}")
             raise
+        finally:
+            producer.cancel()
     
     async def get_file_info(self, path: str) -> FileInfo:
         """Get file/directory information"""
@@ -199,68 +426,91 @@ class P115Adapter(VFSAdapter):
             )
         
         # Get parent directory and filename
-        path_obj = PurePosixPath(path)
-        parent_path = str(path_obj.parent)
-        name = path_obj.name
-        
-        # List parent directory and find the file
-        items = await self.list_dir(parent_path)
-        for item in items:
-            if item.name == name:
+        normalized = self._normalize(path)
+        parent_path, name = _parent_and_name(normalized)
+        
+        if self._cache_get(self._missing_cache, normalized):
+            raise VFSNotFoundError(f"Path not found: {path}")
+        
+        # Use a cached parent listing if there is one
+        cached = self._cache_get(self._list_cache, parent_path)
+        if cached is not None:
+            for item in cached:
+                if item.name == name:
+                    return item
+            raise VFSNotFoundError(f"Path not found: {path}")
+        
+        raw = None
+        parent_cid = await self._get_dir_id(parent_path)
+        if parent_cid is not None:
+            # Scan the parent until the entry turns up
+            raw = await self._find_child(parent_cid, name)
+        
+        if raw is None:
+            self._cache_put(self._missing_cache, normalized, True, NEGATIVE_CACHE_TTL)
+            raise VFSNotFoundError(f"Path not found: {path}")
+        
+        return self._parse_file_item(raw, parent_path)
+    
+    async def _find_child(self, parent_cid: str, name: str) -> Optional[Dict[str, Any]]:
+        """Get the raw item named name in a directory, stopping at the first match"""
+        async for item in self._iter_dir_by_cid(parent_cid):
+            if _field(item, "name", "n", "") == name:
                 return item
+        return None
+    
+    async def _peek(self, path: str) -> Tuple[bool, bool]:
+        """Get (exists, is_dir) for a path from raw items, without building a FileInfo"""
+        await self._ensure_initialized()
+        
+        normalized = self._normalize(path)
+        if normalized == "/" or self._cache_get(self._cid_cache, normalized) is not None:
+            return True, True
+        if self._cache_get(self._missing_cache, normalized):
+            return False, False
+        
+        parent_path, name = _parent_and_name(normalized)
+        
+        # Use a cached parent listing if there is one
+        cached = self._cache_get(self._list_cache, parent_path)
+        if cached is not None:
+            for item in cached:
+                if item.name == name:
+                    return True, item.is_dir
+            return False, False
+        
+        raw = None
+        parent_cid = await self._get_dir_id(parent_path)
+        if parent_cid is not None:
+            raw = await self._find_child(parent_cid, name)
         
-        raise VFSNotFoundError(f"Path not found: {path}")
+        if raw is None:
+            self._cache_put(self._missing_cache, normalized, True, NEGATIVE_CACHE_TTL)
+            return False, False
+        
+        return True, _field(raw, "fc", "fid") is None
     
     async def exists(self, path: str) -> bool:
         """Check if path exists"""
-        try:
-            await self.get_file_info(path)
-            return True
-        except VFSNotFoundError:
-            return False
+        exists, _ = await self._peek(path)
+        return exists
+    
+    async def exists_batch(self, paths: List[str]) -> List[bool]:
+        """Check paths with one listing per parent directory"""
+        return await self._exists_batch_by_parent(paths)
     
     async def is_dir(self, path: str) -> bool:
         """Check if path is a directory"""
-        try:
-            info = await self.get_file_info(path)
-            return info.is_dir
-        except VFSNotFoundError:
-            return False
+        _, is_dir = await self._peek(path)
+        return is_dir
     
     async def mkdir(self, path: str, parents: bool = True) -> bool:
         """Create directory"""
         await self._ensure_initialized()
         
         try:
-            path = path.strip()
-            if not path.startswith("/"):
-                path = "/" + path
-            
-            if await self.exists(path):
-                return True  # Already exists
-            
-            # Get parent directory ID
-            parent_path = str(PurePosixPath(path).parent)
-            name = PurePosixPath(path).name
-            
-            if parents and parent_path != "/" and not await self.exists(parent_path):
-                # Create parent directories
-                await self.mkdir(parent_path, parents=True)
-            
-            parent_cid = await self._get_dir_id(parent_path)
-            if parent_cid is None:
-                raise VFSNotFoundError(f"Parent directory not found: {parent_path}")
-            
-            # Create directory using 115 API
-            resp = await asyncio.to_thread(
-                self._client.fs_mkdir,
-                {"pid": parent_cid, "cname": name}
-            )
-            
-            if resp and resp.get("state", False):
-                return True
-            
-            raise VFSError(f"Failed to create directory: {path}")
+            await self._ensure_dir(path, parents=parents)
+            return True
             
         except VFSNotFoundError:
             raise
@@ -277,37 +527,25 @@ class P115Adapter(VFSAdapter):
             src_info = await self.get_file_info(src)
             
             # Get destination parent directory
-            dst_path = PurePosixPath(dst)
-            dst_parent = str(dst_path.parent)
-            dst_name = dst_path.name
-            
-            # Ensure destination directory exists
-            if not await self.exists(dst_parent):
-                await self.mkdir(dst_parent, parents=True)
-            
-            dst_cid = await self._get_dir_id(dst_parent)
-            if dst_cid is None:
-                raise VFSNotFoundError(f"Destination directory not found: {dst_parent}")
+            dst_parent, dst_name = _parent_and_name(dst)
             
             # Check if we need to rename
             rename_needed = src_info.name != dst_name
-            
-            # Move file using 115 API
             fid = src_info.file_id
-            if src_info.is_dir:
-                # Move directory
-                resp = await asyncio.to_thread(
-                    self._client.fs_move,
-                    {"fid[]": fid, "pid": dst_cid}
-                )
-            else:
+            
+            # Same directory: a rename alone does it
+            if dst_parent != _parent_and_name(src)[0]:
+                # Ensure destination directory exists
+                dst_cid = await self._ensure_dir(dst_parent)
+                
+                # Move file using 115 API
                 resp = await asyncio.to_thread(
                     self._client.fs_move,
                     {"fid[]": fid, "pid": dst_cid}
                 )
-            
-            if not resp or not resp.get("state", False):
-                raise VFSError(f"Failed to move: {src} -> {dst}")
+                
+                if not resp or not resp.get("state", False):
+                    raise VFSError(f"Failed to move: {src} -> {dst}")
             
             # Rename if needed
             if rename_needed:
@@ -319,6 +557,7 @@ class P115Adapter(VFSAdapter):
                 if not resp or not resp.get("state", False):
                     logger.warning(f"Failed to rename file after move: {src_info.name} -> {dst_name}")
             
+            self._invalidate(src, dst)
             return True
             
         except VFSNotFoundError:
@@ -327,6 +566,62 @@ class P115Adapter(VFSAdapter):
             logger.error(f"Error moving {src} -> {dst}: {e}")
             raise VFSError(f"Failed to move: {src} -> {dst}") from e
     
+    async def move_many(self, pairs: List[Tuple[str, str]]) -> bool:
+        """
+        Move several files, one fs_move call per destination directory.
+        
+        Args:
+            pairs: (src, dst) paths
+            
+        Returns:
+            True if all moves succeeded
+        """
+        await self._ensure_initialized()
+        
+        try:
+            infos = await asyncio.gather(*(self.get_file_info(src) for src, _ in pairs))
+            
+            # Group file IDs by destination directory
+            by_parent: Dict[str, List[str]] = defaultdict(list)
+            renames = []
+            for (src, dst), info in zip(pairs, infos):
+                dst_parent, dst_name = _parent_and_name(dst)
+                by_parent[dst_parent].append(info.file_id)
+                if info.name != dst_name:
+                    renames.append((info, dst_name))
+            
+            parents = list(by_parent)
+            cids = await asyncio.gather(*map(self._ensure_dir, parents))
+            for parent, dst_cid in zip(parents, cids):
+                payload = self._fid_payload(by_parent[parent])
+                payload["pid"] = dst_cid
+                resp = await asyncio.to_thread(self._client.fs_move, payload)
+                if not resp or not resp.get("state", False):
+                    raise VFSError(f"Failed to move {len(by_parent[parent])} items to {parent}")
+            
+            async def rename(info: FileInfo, name: str):
+                resp = await asyncio.to_thread(
+                    self._client.fs_rename,
+                    {"fid": info.file_id, "file_name": name}
+                )
+                if not resp or not resp.get("state", False):
+                    logger.warning(f"Failed to rename file after move: {info.name} -> {name}")
+            
+            await asyncio.gather(*(rename(info, name) for info, name in renames))
+            
+            self._invalidate(*(path for pair in pairs for path in pair))
+            return True
+            
+        except VFSNotFoundError:
+            raise
+        except Exception as e:
+            logger.error(f"Error moving {len(pairs)} items: {e}")
+            raise VFSError(f"Failed to move {len(pairs)} items") from e
+    
+    def _fid_payload(self, fids: List[str]) -> Dict[str, Any]:
+        """Build an indexed fid[n] payload for bulk operations"""
+        return {f"fid[{i}]": fid for i, fid in enumerate(fids)}
+    
     async def copy(self, src: str, dst: str, overwrite: bool = True) -> bool:
         """Copy file or directory"""
         await self._ensure_initialized()
@@ -336,16 +631,10 @@ class P115Adapter(VFSAdapter):
             src_info = await self.get_file_info(src)
             
             # Get destination parent directory
-            dst_path = PurePosixPath(dst)
-            dst_parent = str(dst_path.parent)
+            dst_parent = _parent_and_name(dst)[0]
             
             # Ensure destination directory exists
-            if not await self.exists(dst_parent):
-                await self.mkdir(dst_parent, parents=True)
-            
-            dst_cid = await self._get_dir_id(dst_parent)
-            if dst_cid is None:
-                raise VFSNotFoundError(f"Destination directory not found: {dst_parent}")
+            dst_cid = await self._ensure_dir(dst_parent)
             
             # Copy file using 115 API
             fid = src_info.file_id
@@ -355,6 +644,7 @@ class P115Adapter(VFSAdapter):
             )
             
             if resp and resp.get("state", False):
+                self._invalidate(dst)
                 return True
             
             raise VFSError(f"Failed to copy: {src} -> {dst}")
@@ -380,6 +670,7 @@ class P115Adapter(VFSAdapter):
             )
             
             if resp and resp.get("state", False):
+                self._invalidate(path)
                 return True
             
             raise VFSError(f"Failed to delete: {path}")
@@ -390,27 +681,105 @@ class P115Adapter(VFSAdapter):
             logger.error(f"Error deleting {path}: {e}")
             raise VFSError(f"Failed to delete: {path}") from e
     
+    async def delete_many(self, paths: List[str]) -> bool:
+        """
+        Delete several files or directories with one fs_delete call.
+        
+        Args:
+            paths: Paths to delete (missing ones are ignored)
+            
+        Returns:
+            True if deleted successfully
+        """
+        await self._ensure_initialized()
+        
+        try:
+            infos = await asyncio.gather(
+                *map(self.get_file_info, paths), return_exceptions=True
+            )
+            fids = []
+            for info in infos:
+                if isinstance(info, VFSNotFoundError):
+                    continue  # Already doesn't exist
+                if isinstance(info, BaseException):
+                    raise info
+                fids.append(info.file_id)
+            
+            if fids:
+                resp = await asyncio.to_thread(
+                    self._client.fs_delete,
+                    self._fid_payload(fids)
+                )
+                if not resp or not resp.get("state", False):
+                    raise VFSError(f"Failed to delete {len(fids)} items")
+            
+            self._invalidate(*paths)
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error deleting {len(paths)} items: {e}")
+            raise VFSError(f"Failed to delete {len(paths)} items") from e
+    
     async def iter_dir(
         self,
         path: str,
         recursive: bool = False,
         files_only: bool = False
     ) -> AsyncIterator[FileInfo]:
-        """Iterate directory contents"""
+        """
+        Iterate directory contents.
+        
+        Recursive listings are fetched by WALK_WORKERS workers sharing a
+        queue of directory cids, so entries arrive in no particular order.
+        """
         await self._ensure_initialized()
         
-        items = await self.list_dir(path)
+        if not recursive:
+            for item in await self.list_dir(path):
+                if not (files_only and item.is_dir):
+                    yield item
+            return
+        
+        path = self._normalize(path)
+        root_cid = await self._get_dir_id(path)
+        if root_cid is None:
+            raise VFSNotFoundError(f"Path not found: {path}")
         
-        for item in items:
-            if files_only and item.is_dir:
-                if recursive:
-                    async for sub_item in self.iter_dir(item.path, recursive=True, files_only=True):
-                        yield sub_item
-            else:
-                yield item
-                if recursive and item.is_dir:
-                    async for sub_item in self.iter_dir(item.path, recursive=True, files_only=files_only):
-                        yield sub_item
+        work_q: asyncio.Queue = asyncio.Queue()
+        result_q: asyncio.Queue = asyncio.Queue(maxsize=WALK_QUEUE_SIZE)
+        done = object()
+        work_q.put_nowait((root_cid, path))
+        
+        async def worker():
+            while True:
+                cid, dir_path = await work_q.get()
+                try:
+                    async for item in self._iter_dir_by_cid(cid):
+                        info = self._parse_file_item(item, dir_path)
+                        if info.is_dir and info.file_id:
+                            self._cache_put(self._cid_cache, info.path, info.file_id)
+                            work_q.put_nowait((info.file_id, info.path))
+                        await result_q.put(info)
+                except Exception as e:
+                    await result_q.put(VFSError(f"Failed to list directory: {dir_path}: {e}"))
+                finally:
+                    work_q.task_done()
+        
+        async def finish():
+            await work_q.join()
+            await result_q.put(done)
+        
+        tasks = [asyncio.create_task(worker()) for _ in range(WALK_WORKERS)]
+        tasks.append(asyncio.create_task(finish()))
+        try:
+            while (item := await result_q.get()) is not done:
+                if isinstance(item, VFSError):
+                    raise item
+                if not (files_only and item.is_dir):
+                    yield item
+        finally:
+            for task in tasks:
+                task.cancel()
     
     # ============ 115-specific methods ============
     
@@ -436,12 +805,8 @@ class P115Adapter(VFSAdapter):
         await self._ensure_initialized()
         
         try:
-            # Get target directory ID
-            target_cid = await self._get_dir_id(target_path)
-            if target_cid is None:
-                # Create target directory
-                await self.mkdir(target_path, parents=True)
-                target_cid = await self._get_dir_id(target_path)
+            # Get target directory ID, creating it if needed
+            target_cid = await self._ensure_dir(target_path)
             
             # Receive share using 115 API
             params = {
@@ -459,6 +824,10 @@ class P115Adapter(VFSAdapter):
             )
             
             if resp and resp.get("state", False):
+                # New children appear under the target directory
+                target = self._normalize(target_path)
+                self._list_cache.pop(target, None)
+                self._forget_missing(target)
                 return True
             
             error = resp.get("error", "Unknown error")
@@ -5,13 +5,23 @@ Provides access to WebDAV servers.
 
 import asyncio
 import logging
-from datetime import datetime
-from typing import AsyncIterator, List, Optional
-from pathlib import PurePosixPath
-from urllib.parse import urljoin
+import time
+from collections import OrderedDict, defaultdict
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import quote, unquote, urlsplit
 
 import httpx
 
+try:
+    from lxml import etree as ET
+    _LXML = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+    _LXML = False
+
 from .base import VFSAdapter, VFSError, VFSNotFoundError, VFSPermissionError
 from ..models.schemas import StorageType, FileInfo
 from ..core.config import settings
@@ -19,6 +29,120 @@ from ..core.config import settings
 logger = logging.getLogger(__name__)
 
 
+# Idle connections kept open for reuse across requests, and for how long
+WEBDAV_MAX_KEEPALIVE = 50
+WEBDAV_KEEPALIVE_EXPIRY = 60.0
+
+# Parsed PROPFIND results kept per adapter, keyed by (path, depth)
+PROPFIND_CACHE_SIZE = 1024
+
+# Decoded bytes handed to the XML parser per feed() while a body streams in
+PROPFIND_CHUNK_SIZE = 64 * 1024
+
+# Statuses servers use to refuse Depth: infinity PROPFIND
+DEPTH_INFINITY_REFUSED = frozenset({400, 403, 501, 507})
+
+# Only the properties the parser reads; allprop drags in every dead property
+PROPFIND_BODY = (
+    b'<?xml version="1.0"?><d:propfind xmlns:d="DAV:"><d:prop>'
+    b'<d:resourcetype/><d:displayname/><d:getcontentlength/>'
+    b'<d:getlastmodified/><d:getetag/>'
+    b'</d:prop></d:propfind>'
+)
+
+# Fully-qualified DAV: tags, so lookups skip prefix resolution
+_DAV = "{DAV:}"
+_TAG_RESPONSE = _DAV + "response"
+_TAG_HREF = _DAV + "href"
+_TAG_PROPSTAT = _DAV + "propstat"
+_TAG_PROP = _DAV + "prop"
+_TAG_STATUS = _DAV + "status"
+_TAG_RESOURCETYPE = _DAV + "resourcetype"
+_TAG_COLLECTION = _DAV + "collection"
+_TAG_DISPLAYNAME = _DAV + "displayname"
+_TAG_GETCONTENTLENGTH = _DAV + "getcontentlength"
+_TAG_GETLASTMODIFIED = _DAV + "getlastmodified"
+
+
+_MONTHS = {
+    "Jan": 1, "Feb": 2, "Mar": 3, "Apr": 4, "May": 5, "Jun": 6,
+    "Jul": 7, "Aug": 8, "Sep": 9, "Oct": 10, "Nov": 11, "Dec": 12,
+}
+
+
+@lru_cache(maxsize=4096)
+def _url_for(base_url: str, path: str) -> str:
+    """Build the percent-encoded URL of a path under base_url (ends with "/")"""
+    return base_url + quote(path.lstrip("/"))
+
+
+def _join(parent: str, name: str) -> str:
+    """Join a directory path and an entry name"""
+    return parent.rstrip("/") + "/" + name
+
+
+def _parent(path: str) -> str:
+    """Get the parent directory of a "/"-separated path"""
+    path = path.rstrip("/")
+    i = path.rfind("/")
+    return path[:i] if i > 0 else "/"
+
+
+def _basename(path: str) -> str:
+    """Get the last component of a "/"-separated path"""
+    return path.rstrip("/").rsplit("/", 1)[-1]
+
+
+@lru_cache(maxsize=4096)
+def _parse_http_date(value: str) -> Optional[datetime]:
+    """Parse an RFC 2822 getlastmodified date (many entries share one)"""
+    # Fast path for the fixed-width RFC 1123 form servers send:
+    # "Sun, 06 Nov 1994 08:49:37 GMT"
+    if len(value) == 29 and value.endswith(" GMT"):
+        try:
+            return datetime(
+                int(value[12:16]), _MONTHS[value[8:11]], int(value[5:7]),
+                int(value[17:19]), int(value[20:22]), int(value[23:25]),
+                tzinfo=timezone.utc
+            )
+        except (KeyError, ValueError):
+            pass
+    
+    try:
+        return parsedate_to_datetime(value)
+    except (ValueError, TypeError):
+        return None
+
+
+def _response_parser() -> Any:
+    """Create an incremental parser reporting completed <d:response> elements"""
+    if _LXML:
+        # Server responses are untrusted: no entity expansion or network access
+        return ET.XMLPullParser(
+            events=("end",), tag=_TAG_RESPONSE,
+            resolve_entities=False, no_network=True
+        )
+    return ET.XMLPullParser(events=("end",))
+
+
+def _completed_responses(parser: Any) -> Iterator[Any]:
+    """
+    Yield the <d:response> elements the parser has finished so far.
+    
+    Each element is cleared once the caller moves on, so memory stays
+    bounded by one response rather than the whole document.
+    """
+    for _, elem in parser.read_events():
+        if elem.tag != _TAG_RESPONSE:
+            continue
+        yield elem
+        elem.clear()
+        if _LXML:
+            # Drop the cleared siblings still hanging off the root
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+
+
 class WebDAVAdapter(VFSAdapter):
     """VFS adapter for WebDAV servers"""
     
@@ -48,129 +172,291 @@ class WebDAVAdapter(VFSAdapter):
         # Ensure URL ends with /
         if not self._url.endswith("/"):
             self._url += "/"
+        # Server path of the root, for mapping hrefs back to paths
+        self._root_path = unquote(urlsplit(self._url).path)
+        # Cleared once the server refuses a Depth: infinity PROPFIND
+        self._depth_infinity = True
+        # Cleared once the server answers HEAD with 405 Method Not Allowed
+        self._head_allowed = True
         
         # Create HTTP client
         auth = None
         if self._username and self._password:
             auth = (self._username, self._password)
         
+        # One pooled client per adapter; keep-alive lets concurrent
+        # transfers reuse connections instead of reconnecting, and HTTP/2
+        # servers multiplex concurrent requests over one connection
         self._client = httpx.AsyncClient(
             auth=auth,
-            timeout=30.0,
-            follow_redirects=True
+            timeout=httpx.Timeout(30.0, connect=5.0),
+            follow_redirects=True,
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=100,
+                max_keepalive_connections=WEBDAV_MAX_KEEPALIVE,
+                keepalive_expiry=WEBDAV_KEEPALIVE_EXPIRY
+            )
         )
+        
+        # (path, depth) -> (expires_at, etag, items); writes through this
+        # adapter invalidate the affected entries
+        self._cache: Dict[Tuple[str, int], Tuple[float, Optional[str], List[FileInfo]]] = OrderedDict()
+        self._cache_ttl = settings.storage.webdav_cache_ttl
+        # (path, depth) -> PROPFIND task that concurrent callers share
+        self._inflight: Dict[Tuple[str, int], asyncio.Task] = {}
     
     def _full_url(self, path: str) -> str:
         """Get full URL for a path"""
-        path = path.lstrip("/")
-        return urljoin(self._url, path)
+        return _url_for(self._url, path)
     
-    def _parse_propfind_response(
+    def _cache_key(self, path: str) -> str:
+        """Normalize a path to "/a/b" form for cache keys"""
+        return "/" + path.strip().strip("/")
+    
+    def _cache_put(self, key: Tuple[str, int], etag: Optional[str], items: List[FileInfo]):
+        """Store a PROPFIND result for the configured TTL, evicting the oldest"""
+        if self._cache_ttl <= 0:
+            return
+        self._cache[key] = (time.monotonic() + self._cache_ttl, etag, items)
+        self._cache.move_to_end(key)
+        while len(self._cache) > PROPFIND_CACHE_SIZE:
+            self._cache.popitem(last=False)
+    
+    def _cache_fresh(self, key: Tuple[str, int]) -> Optional[List[FileInfo]]:
+        """Get an unexpired cached PROPFIND result, or None"""
+        entry = self._cache.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        return entry[2]
+    
+    def _invalidate(self, *paths: str):
+        """Drop cached results for paths, their subtrees and their parents' listings"""
+        for path in paths:
+            path = self._cache_key(path)
+            prefix = path.rstrip("/") + "/"
+            parent = _parent(path)
+            for key in [
+                k for k in self._cache
+                if k[0] == path or k[0].startswith(prefix) or k == (parent, 1)
+            ]:
+                del self._cache[key]
+    
+    async def _propfind(self, path: str, depth: int, base_path: str) -> List[FileInfo]:
+        """
+        PROPFIND a path and parse the entries.
+        
+        Concurrent calls for the same path and depth share one request;
+        a caller being cancelled doesn't cancel it for the others.
+        """
+        key = (self._cache_key(path), depth)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_propfind(key, path, depth, base_path))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+    
+    async def _fetch_propfind(
         self,
-        xml_text: str,
+        key: Tuple[str, int],
+        path: str,
+        depth: int,
         base_path: str
     ) -> List[FileInfo]:
-        """Parse PROPFIND XML response"""
-        import xml.etree.ElementTree as ET
+        """
+        Body of _propfind().
         
-        # XML namespaces
-        ns = {
-            "d": "DAV:",
-        }
+        Fresh cached results are returned without a request; stale ones
+        are revalidated with If-None-Match when the server sent an ETag.
+        """
+        headers = {"Depth": str(depth)}
         
-        items = []
+        entry = self._cache.get(key)
+        if entry is not None:
+            expires, etag, items = entry
+            if expires > time.monotonic():
+                self._cache.move_to_end(key)
+                return items
+            if etag:
+                headers["If-None-Match"] = etag
         
-        try:
-            root = ET.fromstring(xml_text)
+        async with self._client.stream(
+            "PROPFIND",
+            self._full_url(path),
+            headers=headers,
+            content=PROPFIND_BODY
+        ) as response:
+            if response.status_code == 304 and entry is not None:
+                self._cache_put(key, entry[1], entry[2])
+                return entry[2]
             
-            for response in root.findall(".//d:response", ns):
-                href_elem = response.find("d:href", ns)
-                if href_elem is None:
-                    continue
-                
-                href = href_elem.text or ""
-                
-                # Get properties
-                propstat = response.find("d:propstat", ns)
-                if propstat is None:
-                    continue
-                
-                prop = propstat.find("d:prop", ns)
-                if prop is None:
+            if response.status_code == 404:
+                raise VFSNotFoundError(f"Path not found: {path}")
+            
+            if response.status_code == 401:
+                raise VFSPermissionError("Authentication failed")
+            
+            response.raise_for_status()
+            
+            try:
+                items = await self._parse_stream(response, base_path)
+            except ET.ParseError as e:
+                logger.error(f"Failed to parse PROPFIND response: {e}")
+                return []
+            
+            self._cache_put(key, response.headers.get("ETag"), items)
+            return items
+    
+    async def _propfind_tree(self, path: str) -> Optional[Dict[str, List[FileInfo]]]:
+        """
+        List a whole subtree with one Depth: infinity PROPFIND.
+        
+        Returns entries bucketed by parent directory (every directory in
+        the tree gets a bucket), or None if the server refuses the depth.
+        Each bucket also seeds the depth-1 cache.
+        """
+        if not self._depth_infinity:
+            return None
+        
+        root = self._cache_key(path)
+        async with self._client.stream(
+            "PROPFIND",
+            self._full_url(path),
+            headers={"Depth": "infinity"},
+            content=PROPFIND_BODY
+        ) as response:
+            if response.status_code in DEPTH_INFINITY_REFUSED:
+                logger.info(f"WebDAV server refused Depth: infinity ({response.status_code}), listing per directory")
+                self._depth_infinity = False
+                return None
+            
+            if response.status_code == 404:
+                raise VFSNotFoundError(f"Path not found: {path}")
+            
+            if response.status_code == 401:
+                raise VFSPermissionError("Authentication failed")
+            
+            response.raise_for_status()
+            
+            items = await self._parse_stream(response, None)
+        
+        tree: Dict[str, List[FileInfo]] = defaultdict(list, {root: []})
+        for item in items:
+            if item.path == root:
+                continue
+            tree[_parent(item.path)].append(item)
+            if item.is_dir:
+                tree.setdefault(item.path, [])
+        
+        for dir_path, children in tree.items():
+            self._cache_put((dir_path, 1), None, children)
+        return tree
+    
+    def _href_to_path(self, href: str) -> str:
+        """Map a response href (URL or server path) back to an adapter path"""
+        href_path = unquote(urlsplit(href).path)
+        if href_path.startswith(self._root_path):
+            href_path = href_path[len(self._root_path):]
+        return "/" + href_path.strip("/")
+    
+    async def _parse_stream(self, response: Any, base_path: Optional[str]) -> List[FileInfo]:
+        """Parse a multistatus body while it is still arriving"""
+        parser = _response_parser()
+        items = []
+        async for chunk in response.aiter_bytes(PROPFIND_CHUNK_SIZE):
+            parser.feed(chunk)
+            items.extend(self._parse_propfind_response(parser, base_path))
+        parser.close()
+        items.extend(self._parse_propfind_response(parser, base_path))
+        return items
+    
+    def _parse_propfind_response(
+        self,
+        parser: Any,
+        base_path: Optional[str]
+    ) -> List[FileInfo]:
+        """
+        Parse the PROPFIND responses the parser has completed so far.
+        
+        Paths are base_path joined with each entry's name, or with no
+        base_path, taken from the hrefs (for multi-level responses).
+        """
+        items = []
+        
+        for response in _completed_responses(parser):
+            href_elem = response.find(_TAG_HREF)
+            if href_elem is None:
+                continue
+            
+            href = href_elem.text or ""
+            
+            # Get properties
+            # Properties may be split over several propstats; keep only
+            # those reported with a 200 status
+            props = {}
+            for propstat in response.iter(_TAG_PROPSTAT):
+                status = propstat.find(_TAG_STATUS)
+                if status is not None and " 200 " not in f"{status.text} ":
                     continue
-                
-                # Check if it's a collection (directory)
-                resourcetype = prop.find("d:resourcetype", ns)
-                is_dir = resourcetype is not None and resourcetype.find("d:collection", ns) is not None
-                
+                prop = propstat.find(_TAG_PROP)
+                if prop is not None:
+                    props.update((child.tag, child) for child in prop)
+            if not props:
+                continue
+            
+            # Check if it's a collection (directory)
+            resourcetype = props.get(_TAG_RESOURCETYPE)
+            is_dir = resourcetype is not None and resourcetype.find(_TAG_COLLECTION) is not None
+            
+            if base_path is None:
+                path = self._href_to_path(href)
+                name = _basename(path)
+            else:
                 # Get display name or derive from href
-                displayname = prop.find("d:displayname", ns)
-                name = displayname.text if displayname is not None and displayname.text else href.rstrip("/").split("/")[-1]
+                displayname = props.get(_TAG_DISPLAYNAME)
+                name = displayname.text if displayname is not None and displayname.text else unquote(_basename(href))
                 
                 # Skip the base path itself
-                if not name or href.rstrip("/") == base_path.rstrip("/"):
+                if not name or self._href_to_path(href) == self._cache_key(base_path):
                     continue
                 
-                # Get content length
-                contentlength = prop.find("d:getcontentlength", ns)
-                size = int(contentlength.text) if contentlength is not None and contentlength.text else 0
-                
-                # Get last modified
-                lastmodified = prop.find("d:getlastmodified", ns)
-                modified_time = None
-                if lastmodified is not None and lastmodified.text:
-                    try:
-                        # Parse RFC 2822 date
-                        from email.utils import parsedate_to_datetime
-                        modified_time = parsedate_to_datetime(lastmodified.text)
-                    except (ValueError, TypeError):
-                        pass
-                
-                # Get extension
-                extension = None
-                if not is_dir and "." in name:
-                    extension = "." + name.rsplit(".", 1)[-1].lower()
-                
                 # Build full path
-                path = str(PurePosixPath(base_path) / name)
-                
-                items.append(FileInfo(
-                    name=name,
-                    path=path,
-                    size=size,
-                    is_dir=is_dir,
-                    extension=extension,
-                    modified_time=modified_time,
-                    storage_type=StorageType.WEBDAV
-                ))
-                
-        except ET.ParseError as e:
-            logger.error(f"Failed to parse PROPFIND response: {e}")
+                path = _join(base_path, name)
+            
+            # Get content length
+            contentlength = props.get(_TAG_GETCONTENTLENGTH)
+            size = int(contentlength.text) if contentlength is not None and contentlength.text else 0
+            
+            # Get last modified
+            lastmodified = props.get(_TAG_GETLASTMODIFIED)
+            modified_time = None
+            if lastmodified is not None and lastmodified.text:
+                modified_time = _parse_http_date(lastmodified.text)
+            
+            # Get extension
+            extension = None
+            if not is_dir and "." in name:
+                extension = "." + name.rsplit(".", 1)[-1].lower()
+            
+            # Fields are already typed here, so skip validation
+            items.append(FileInfo.model_construct(
+                name=name,
+                path=path,
+                size=size,
+                is_dir=is_dir,
+                extension=extension,
+                modified_time=modified_time,
+                storage_type=StorageType.WEBDAV
+            ))
         
         return items
     
     async def list_dir(self, path: str) -> List[FileInfo]:
         """List directory contents"""
         try:
-            url = self._full_url(path)
-            
             # PROPFIND request with depth 1
-            response = await self._client.request(
-                "PROPFIND",
-                url,
-                headers={"Depth": "1"},
-                content='<?xml version="1.0"?><d:propfind xmlns:d="DAV:"><d:allprop/></d:propfind>'
-            )
-            
-            if response.status_code == 404:
-                raise VFSNotFoundError(f"Path not found: {path}")
-            
-            if response.status_code == 401:
-                raise VFSPermissionError("Authentication failed")
-            
-            response.raise_for_status()
-            
-            return self._parse_propfind_response(response.text, path)
+            return list(await self._propfind(path, 1, path))
             
         except VFSNotFoundError:
             raise
@@ -183,34 +469,18 @@ class WebDAVAdapter(VFSAdapter):
     async def get_file_info(self, path: str) -> FileInfo:
         """Get file/directory information"""
         try:
-            url = self._full_url(path)
-            
-            # PROPFIND request with depth 0
-            response = await self._client.request(
-                "PROPFIND",
-                url,
-                headers={"Depth": "0"},
-                content='<?xml version="1.0"?><d:propfind xmlns:d="DAV:"><d:allprop/></d:propfind>'
-            )
-            
-            if response.status_code == 404:
-                raise VFSNotFoundError(f"Path not found: {path}")
-            
-            response.raise_for_status()
-            
-            # Parse response - should have one item
-            parent_path = str(PurePosixPath(path).parent)
-            items = self._parse_propfind_response(response.text, parent_path)
+            # PROPFIND request with depth 0 - should have one item
+            parent_path = _parent(path)
+            items = await self._propfind(path, 0, parent_path)
+            name = _basename(path)
             
             if items:
                 # Find the matching item
-                name = PurePosixPath(path).name
                 for item in items:
                     if item.name == name:
                         return item
             
             # If no match, create from the raw response
-            name = PurePosixPath(path).name
             return FileInfo(
                 name=name,
                 path=path,
@@ -226,13 +496,47 @@ class WebDAVAdapter(VFSAdapter):
             raise VFSError(f"Failed to get file info: {path}") from e
     
     async def exists(self, path: str) -> bool:
-        """Check if path exists"""
+        """
+        Check if path exists.
+        
+        Answered from a fresh cached listing of the parent when there is
+        one, otherwise with a body-less HEAD request (falling back to
+        PROPFIND when the server refuses HEAD, e.g. 403 for collections
+        without directory indexes).
+        """
+        key = self._cache_key(path)
+        listing = self._cache_fresh((_parent(key), 1))
+        if listing is not None and key != "/":
+            return any(self._cache_key(item.path) == key for item in listing)
+        
+        if self._head_allowed:
+            try:
+                response = await self._client.head(self._full_url(path))
+            except Exception as e:
+                logger.error(f"Error checking {path}: {e}")
+                raise VFSError(f"Failed to check path: {path}") from e
+            
+            if response.status_code == 401:
+                raise VFSPermissionError("Authentication failed")
+            if response.status_code == 404:
+                return False
+            if response.status_code < 400:
+                return True
+            if response.status_code >= 500:
+                raise VFSError(f"Failed to check path: {path} ({response.status_code})")
+            if response.status_code == 405:
+                self._head_allowed = False
+        
         try:
             await self.get_file_info(path)
             return True
         except VFSNotFoundError:
             return False
     
+    async def exists_batch(self, paths: List[str]) -> List[bool]:
+        """Check paths with one listing per parent directory"""
+        return await self._exists_batch_by_parent(paths)
+    
     async def is_dir(self, path: str) -> bool:
         """Check if path is a directory"""
         try:
@@ -244,28 +548,33 @@ class WebDAVAdapter(VFSAdapter):
     async def mkdir(self, path: str, parents: bool = True) -> bool:
         """Create directory"""
         try:
-            if await self.exists(path):
-                return True
-            
+            # Check the path and (with parents) every ancestor at once
+            chain = [path]
             if parents:
-                # Create parent directories
-                parent = str(PurePosixPath(path).parent)
-                if parent and parent != "/" and not await self.exists(parent):
-                    await self.mkdir(parent, parents=True)
-            
-            url = self._full_url(path)
-            response = await self._client.request("MKCOL", url)
-            
-            if response.status_code in (201, 405):  # Created or already exists
-                return True
-            
-            response.raise_for_status()
+                parts = self._cache_key(path)[1:].split("/")
+                chain = ["/" + "/".join(parts[:i]) for i in range(1, len(parts) + 1)]
+            found = await asyncio.gather(*map(self.exists, chain))
+            
+            # Create everything below the deepest existing directory, in order
+            start = next((i + 1 for i in range(len(chain) - 1, -1, -1) if found[i]), 0)
+            for dir_path in chain[start:]:
+                await self._mkcol(dir_path)
             return True
             
         except Exception as e:
             logger.error(f"Error creating directory {path}: {e}")
             raise VFSError(f"Failed to create directory: {path}") from e
     
+    async def _mkcol(self, path: str):
+        """Create one directory whose parent exists"""
+        response = await self._client.request("MKCOL", self._full_url(path))
+        self._invalidate(path)
+        
+        if response.status_code in (201, 405):  # Created or already exists
+            return
+        
+        response.raise_for_status()
+    
     async def move(self, src: str, dst: str, overwrite: bool = True) -> bool:
         """Move file or directory"""
         try:
@@ -273,7 +582,7 @@ class WebDAVAdapter(VFSAdapter):
             dst_url = self._full_url(dst)
             
             # Ensure destination directory exists
-            dst_parent = str(PurePosixPath(dst).parent)
+            dst_parent = _parent(dst)
             if not await self.exists(dst_parent):
                 await self.mkdir(dst_parent, parents=True)
             
@@ -284,6 +593,7 @@ class WebDAVAdapter(VFSAdapter):
                 headers["Overwrite"] = "F"
             
             response = await self._client.request("MOVE", src_url, headers=headers)
+            self._invalidate(src, dst)
             
             if response.status_code in (201, 204):
                 return True
@@ -302,7 +612,7 @@ class WebDAVAdapter(VFSAdapter):
             dst_url = self._full_url(dst)
             
             # Ensure destination directory exists
-            dst_parent = str(PurePosixPath(dst).parent)
+            dst_parent = _parent(dst)
             if not await self.exists(dst_parent):
                 await self.mkdir(dst_parent, parents=True)
             
@@ -313,6 +623,7 @@ class WebDAVAdapter(VFSAdapter):
                 headers["Overwrite"] = "F"
             
             response = await self._client.request("COPY", src_url, headers=headers)
+            self._invalidate(dst)
             
             if response.status_code in (201, 204):
                 return True
@@ -326,9 +637,25 @@ class WebDAVAdapter(VFSAdapter):
     
     async def delete(self, path: str, recursive: bool = False) -> bool:
         """Delete file or directory"""
+        if not recursive:
+            # DELETE on a collection always removes its members, so refuse
+            # a non-empty directory here (a file lists as empty). The
+            # listing must be fresh: a stale one could hide new children
+            key = (self._cache_key(path), 1)
+            self._cache.pop(key, None)
+            try:
+                children = await self._fetch_propfind(key, path, 1, path)
+            except VFSNotFoundError:
+                return True
+            if children:
+                raise VFSError(f"Directory not empty: {path}")
+        
         try:
             url = self._full_url(path)
-            response = await self._client.request("DELETE", url)
+            response = await self._client.request(
+                "DELETE", url, headers={"Depth": "infinity"}
+            )
+            self._invalidate(path)
             
             if response.status_code in (200, 204, 404):  # Success or not found
                 return True
@@ -347,18 +674,45 @@ class WebDAVAdapter(VFSAdapter):
         files_only: bool = False
     ) -> AsyncIterator[FileInfo]:
         """Iterate directory contents"""
-        items = await self.list_dir(path)
+        if recursive:
+            # One request for the whole tree where the server allows it
+            try:
+                tree = await self._propfind_tree(path)
+            except (VFSNotFoundError, VFSPermissionError):
+                raise
+            except Exception as e:
+                logger.error(f"Error listing tree {path}: {e}")
+                raise VFSError(f"Failed to list directory: {path}") from e
+            
+            if tree is not None:
+                stack = [self._cache_key(path)]
+                while stack:
+                    for item in tree.get(stack.pop(), ()):
+                        if item.is_dir:
+                            stack.append(item.path)
+                            if files_only:
+                                continue
+                        yield item
+                return
+            
+            # Otherwise list level by level, directories concurrently
+            async for item in super().walk(path, files_only=files_only):
+                yield item
+            return
         
-        for item in items:
+        for item in await self.list_dir(path):
             if files_only and item.is_dir:
-                if recursive:
-                    async for sub_item in self.iter_dir(item.path, recursive=True, files_only=True):
-                        yield sub_item
-            else:
-                yield item
-                if recursive and item.is_dir:
-                    async for sub_item in self.iter_dir(item.path, recursive=True, files_only=files_only):
-                        yield sub_item
+                continue
+            yield item
+    
+    async def walk(
+        self,
+        path: str,
+        files_only: bool = True
+    ) -> AsyncIterator[FileInfo]:
+        """Walk directory tree recursively (one Depth: infinity PROPFIND where allowed)"""
+        async for item in self.iter_dir(path, recursive=True, files_only=files_only):
+            yield item
     
     async def close(self):
         """Close HTTP client"""